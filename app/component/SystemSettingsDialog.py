@@ -1,22 +1,37 @@
+import asyncio
+import logging
+
 import flet as ft
 
 from app.component.ThemeManager import ThemeManager
 from app.component.notifications import NotificationManager
+from app.utils.write_buffer import WriteBuffer
+
+logger = logging.getLogger(__name__)
 
 
 class SystemSettingsDialog:
     """系统设置弹窗，包含动态配置加载和保存功能"""
 
-    def __init__(self, page: ft.Page, view_model):
+    def __init__(self, page: ft.Page, view_model, settings_store=None, on_settings_changed=None):
         """
         :param page: Flet 页面实例
         :param view_model: 系统配置的视图模型（SystemConfigViewModel 实例）
+        :param settings_store: 设置存储，传入时修改通过设置存储写入，与其他途径的写入共用同一个写入队列
+        :param on_settings_changed: 保存成功后的回调
         """
         self.page = page
         self.view_model = view_model
+        self.settings_store = settings_store
+        self.on_settings_changed = on_settings_changed
         self.dialog = None
         self.form_controls = {}
+        self.original_values = {}  # 打开弹窗时的配置值，保存时只写入有变化的项
         self.theme_manager = ThemeManager()  # 初始化 ThemeManager
+        # 输入过程中的实时预览按键合并，停止输入后统一应用并只刷新一次页面
+        self._preview_buffer = WriteBuffer(
+            self._apply_changes, delay=0.3, max_wait=1.0, name="SettingsPreview"
+        )
 
     def show(self):
         """显示系统设置弹窗"""
@@ -30,7 +45,7 @@ class SystemSettingsDialog:
         self.dialog = ft.AlertDialog(
             title=ft.Text("系统设置", size=18, weight=ft.FontWeight.BOLD),
             content=settings_content,
-            on_dismiss=lambda e: print("设置弹窗已关闭"),
+            on_dismiss=self._on_dismiss,
         )
 
         # 打开弹窗
@@ -46,6 +61,7 @@ class SystemSettingsDialog:
             key = config_item["key"]
             config_val = config_item["value"]
             config_desc = config_item["description"]
+            self.original_values[key] = (config_val or "").strip()
 
             desc_text = ft.Text(
                 f"{config_desc} ({key})",
@@ -65,7 +81,7 @@ class SystemSettingsDialog:
                         ft.dropdown.Option("blue", "蓝色"),
                         ft.dropdown.Option("green", "绿色"),
                     ],
-                    on_change=lambda e, k=key: self._apply_setting(k, e.control.value),
+                    on_change=lambda e, k=key: self._preview_buffer.set(k, e.control.value),
                 )
             # 如果是其他配置项，使用 TextField
             else:
@@ -74,7 +90,7 @@ class SystemSettingsDialog:
                     value=config_val,
                     border=ft.InputBorder.OUTLINE,
                     width=200,
-                    on_change=lambda e, k=key: self._apply_setting(k, e.control.value.strip()),
+                    on_change=lambda e, k=key: self._preview_buffer.set(k, e.control.value.strip()),
                 )
 
             # 存储控件引用
@@ -122,8 +138,18 @@ class SystemSettingsDialog:
             width=400,
         )
 
-    def _apply_setting(self, key, value):
-        """实时应用设置到页面"""
+    def _apply_changes(self, changes: dict):
+        """应用合并后的设置变更，所有变更只刷新一次页面"""
+        applied = [self._apply_setting(key, value, update=False) for key, value in changes.items()]
+        if any(applied):
+            self.page.update()
+
+    def _apply_setting(self, key, value, update=True):
+        """
+        实时应用设置到页面
+        :param update: 是否立即刷新页面，批量应用时由调用方统一刷新
+        :return: 是否应用成功
+        """
         try:
             if key == "theme":
                 # 动态切换主题
@@ -140,7 +166,7 @@ class SystemSettingsDialog:
                     NotificationManager.show_notification(
                         self.page, f"无效透明度值: {ve}", success=False
                     )
-                    return
+                    return False
             elif key == "window_width":
                 # 验证并更新窗口宽度 (范围: 300 - 3000)
                 try:
@@ -153,7 +179,7 @@ class SystemSettingsDialog:
                     NotificationManager.show_notification(
                         self.page, f"无效窗口宽度: {ve}", success=False
                     )
-                    return
+                    return False
             elif key == "window_height":
                 # 验证并更新窗口高度 (范围: 300 - 3000)
                 try:
@@ -166,27 +192,43 @@ class SystemSettingsDialog:
                     NotificationManager.show_notification(
                         self.page, f"无效窗口高度: {ve}", success=False
                     )
-                    return
+                    return False
 
-            self.page.update()  # 刷新页面
+            if update:
+                self.page.update()  # 刷新页面
+            return True
         except Exception as e:
             NotificationManager.show_notification(
                 self.page, f"应用设置时发生错误: {e}", success=False
             )
+            return False
 
-    def _on_save_click(self, e):
-        """保存配置数据"""
+    async def _on_save_click(self, e):
+        """保存配置数据，数据库写入在后台线程或异步仓储中完成，不阻塞界面"""
         try:
+            # 先应用尚未生效的预览，同步操作放到线程中执行，不阻塞事件循环
+            await asyncio.to_thread(self._preview_buffer.flush, True)
+
+            # 只写入有修改的配置（以 config_key 作为唯一标识）
+            changes = {}
             for key, controls in self.form_controls.items():
-                # 提取控件值
-                control = controls["value"]
-                new_value = control.value.strip()
-
-                # 更新配置到数据库
-                self.view_model.update_config(
-                    config_id=key,  # 使用 config_key 作为唯一标识
-                    updates={"config_value": new_value},  # 确保键名与模型字段一致
-                )
+                new_value = (controls["value"].value or "").strip()
+                if new_value != self.original_values.get(key):
+                    changes[key] = new_value
+
+            if changes and self.settings_store is not None:
+                # 通过设置存储写入并等待写出，避免与其写入队列中尚未写出的旧值互相覆盖
+                await asyncio.to_thread(self.settings_store.update, changes)
+                await asyncio.to_thread(self.settings_store.flush, True)
+                self.original_values.update(changes)
+            elif changes:
+                # 所有修改在一个事务中写入数据库
+                if await self.view_model.update_values_async(changes) is None:
+                    raise RuntimeError("写入数据库失败")
+                self.original_values.update(changes)
+
+            if self.on_settings_changed:
+                await asyncio.to_thread(self.on_settings_changed)
 
             # 弹出保存成功通知
             NotificationManager.show_notification(self.page, "设置保存成功！", success=True)
@@ -200,5 +242,11 @@ class SystemSettingsDialog:
 
     def _on_cancel_click(self, e):
         """取消修改，关闭弹窗"""
+        self._preview_buffer.discard()
         self.dialog.open = False
         self.page.update()
+
+    def _on_dismiss(self, e):
+        """弹窗关闭时丢弃尚未应用的预览"""
+        self._preview_buffer.discard()
+        logger.debug("设置弹窗已关闭")
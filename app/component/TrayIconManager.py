@@ -1,7 +1,11 @@
 from threading import Thread
 
-from PIL import Image, ImageDraw
-from pystray import Icon, Menu, MenuItem
+from app.utils.lazy_import import lazy_import
+
+# PIL 和 pystray 只在托盘图标启动时加载
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+pystray = lazy_import("pystray")
 
 
 class TrayIconManager:
@@ -40,13 +44,13 @@ class TrayIconManager:
         image = self._load_icon()
 
         # 创建托盘菜单
-        menu = Menu(
-            MenuItem('打开软件', show_window),
-            MenuItem('退出', on_quit)
+        menu = pystray.Menu(
+            pystray.MenuItem('打开软件', show_window),
+            pystray.MenuItem('退出', on_quit)
         )
 
         # 创建托盘图标
-        self.icon = Icon(self.title, image, self.title, menu)
+        self.icon = pystray.Icon(self.title, image, self.title, menu)
 
     def _load_icon(self):
         """加载托盘图标"""
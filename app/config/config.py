@@ -1,8 +1,16 @@
-from dynaconf import Dynaconf
+from app.utils.lazy_import import lazy_object
 
-settings = Dynaconf(
-    settings_files=['app/config/settings.toml'],
-)
+
+def _load_settings():
+    """创建 Dynaconf 配置对象，首次读取配置时才加载 dynaconf"""
+    from dynaconf import Dynaconf
+
+    return Dynaconf(
+        settings_files=['app/config/settings.toml'],
+    )
+
+
+settings = lazy_object(_load_settings, name="dynaconf")
 
 # 颜色 & 背景等全局定义
 WECHAT_GREEN = "#1AAD19"  # 微信绿色
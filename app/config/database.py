@@ -1,12 +1,14 @@
 import os
 import sys
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config.config import settings
-from app.db.models import Base, SystemConfig, DEFAULT_CONFIGS
+from app.db.migrations import MigrationRunner
+from app.db.models import Base, DEFAULT_CONFIGS
+from app.db.sqlite_profile import apply_profile, load_profile
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,8 @@ class DatabaseManager:
     """
     数据库管理类
     负责数据库初始化、会话管理和基础数据维护
+    写入使用单连接的写引擎，所有写事务串行执行；
+    读取使用只读连接池，WAL 模式下读取不会等待写入，异步引擎同样只读
     """
 
     def __init__(self):
@@ -26,15 +30,42 @@ class DatabaseManager:
         os.makedirs(os.path.dirname(database_path), exist_ok=True)
 
         # 创建数据库引擎和会话工厂
+        self.database_path = database_path
         database_url = f"sqlite:///{database_path}"
+        echo = settings.get("database.echo", False)  # SQL 日志
+        profile = load_profile(settings)
+        self._profile = profile
+        self._async_engine = None
+        self._async_session_factory = None
+        self.migrations = None
+
+        # 写引擎：只有一个连接，写事务在连接池处排队，避免 SQLite 写锁竞争
         self.engine = create_engine(
             database_url,
             connect_args={'check_same_thread': False},
-            echo=settings.get("database.echo", False)  # SQL 日志
+            echo=echo,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=settings.get("database.write_timeout", 30),
         )
-        
+        # 每个连接建立时应用 WAL、同步级别、缓存等参数
+        apply_profile(self.engine, profile)
+
+        # 读引擎：只读连接池，供界面和调度任务的查询使用
+        self.read_engine = create_engine(
+            database_url,
+            connect_args={'check_same_thread': False},
+            echo=echo,
+            pool_size=settings.get("database.read_pool_size", 4),
+            max_overflow=settings.get("database.read_max_overflow", 4),
+        )
+        apply_profile(self.read_engine, profile)
+        event.listen(self.read_engine, "connect", self._set_query_only)
+
         self.SessionFactory = sessionmaker(bind=self.engine)
         self.Session = scoped_session(self.SessionFactory)
+        self.ReadSessionFactory = sessionmaker(bind=self.read_engine)
+        self.ReadSession = scoped_session(self.ReadSessionFactory)
 
         # 初始化数据库
         self._initialize_database(database_path)
@@ -65,6 +96,15 @@ class DatabaseManager:
             Base.metadata.create_all(self.engine)
             logger.info("数据库表结构已创建或更新")
 
+            # create_all 不会修改已存在的表，字段和索引的变更通过版本化迁移完成；
+            # 新数据库已是最新结构，直接标记所有迁移为已完成
+            self.migrations = MigrationRunner(self.engine)
+            if is_new_db:
+                self.migrations.stamp()
+            else:
+                self.migrations.upgrade()
+                self.migrations.start_backfills()
+
             # 如果是新数据库，初始化默认数据
             if is_new_db:
                 self._initialize_default_data()
@@ -94,34 +134,40 @@ class DatabaseManager:
             raise
 
     def _init_system_configs(self, session):
-        """初始化系统配置"""
-        try:
-            for config in DEFAULT_CONFIGS:
-                existing = session.query(SystemConfig).filter_by(
-                    config_key=config["config_key"]
-                ).first()
-                
-                if not existing:
-                    session.add(SystemConfig(**config))
-                    logger.info(f"添加默认配置: {config['config_key']}")
-                else:
-                    logger.debug(f"配置已存在: {config['config_key']}")
+        """初始化系统配置，缺失的默认配置一次批量写入，已存在的保持不变"""
+        from app.repository.system_config_repository import SystemConfigRepository
 
-        except SQLAlchemyError as e:
-            logger.error(f"初始化系统配置失败: {e}")
-            raise
+        written = SystemConfigRepository(session).bulk_upsert_configs(DEFAULT_CONFIGS, update_fields=())
+        if written is None:
+            raise SQLAlchemyError("初始化系统配置失败")
+        logger.info(f"添加默认配置: {written} 项")
 
-    def get_session(self):
-        """获取数据库会话"""
-        return self.Session()
+    @staticmethod
+    def _set_query_only(dbapi_connection, connection_record):
+        """读连接禁止写入，误用时立即报错而不是占用写锁"""
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA query_only=1")
+        finally:
+            cursor.close()
+
+    def get_session(self, read_only=False):
+        """
+        获取数据库会话
+        :param read_only: 是否使用只读连接池，只查询时应传 True
+        """
+        return self.ReadSession() if read_only else self.Session()
 
-    def get_session_context(self):
+    def get_session_context(self, read_only=False):
         """
         获取数据库会话上下文管理器
         用于确保会话正确关闭
+        :param read_only: 是否使用只读连接池
         使用示例:
             with db_manager.get_session_context() as session:
                 session.query(...)
+            with db_manager.get_session_context(read_only=True) as session:
+                session.query(...)
         """
         class SessionContext:
             def __init__(self, session_factory):
@@ -136,10 +182,55 @@ class DatabaseManager:
                     logger.error(f"会话异常: {exc_val}")
                 self.session.close()
 
-        return SessionContext(self.Session)
+        return SessionContext(self.ReadSession if read_only else self.Session)
+
+    @property
+    def async_engine(self):
+        """
+        异步只读引擎（aiosqlite），首次使用时创建
+        与读引擎一样禁止写入，数据库只有写引擎一个写入方；
+        异步代码需要写入时通过 asyncio.to_thread 使用写会话
+        """
+        if self._async_engine is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+            self._async_engine = create_async_engine(
+                f"sqlite+aiosqlite:///{self.database_path}",
+                echo=settings.get("database.echo", False),
+                pool_size=settings.get("database.read_pool_size", 4),
+                max_overflow=settings.get("database.read_max_overflow", 4),
+            )
+            apply_profile(self._async_engine.sync_engine, self._profile)
+            event.listen(self._async_engine.sync_engine, "connect", self._set_query_only)
+            self._async_session_factory = async_sessionmaker(
+                self._async_engine, expire_on_commit=False
+            )
+        return self._async_engine
+
+    def get_async_session(self):
+        """
+        获取异步数据库会话，只能用于查询
+        使用示例:
+            async with db_manager.get_async_session() as session:
+                await session.execute(...)
+        """
+        self.async_engine  # 确保引擎和会话工厂已创建
+        return self._async_session_factory()
+
+    async def dispose_async(self):
+        """释放异步引擎的连接"""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_factory = None
 
     def dispose(self):
         """释放数据库连接池资源"""
-        if self.engine:
-            self.engine.dispose()
-            logger.info("数据库连接池已释放")
+        if self.migrations is not None:
+            self.migrations.stop()
+        self.ReadSession.remove()
+        self.Session.remove()
+        for engine in (self.read_engine, self.engine):
+            if engine:
+                engine.dispose()
+        logger.info("数据库连接池已释放")
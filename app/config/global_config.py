@@ -4,5 +4,8 @@ from app.utils.log_utils import LogUtils
 class GlobalConfig:
     """全局配置单例类"""
     db_manager = None
+    settings_store = None     # 统一设置存储，见 get_settings_store()
+    scheduler_manager = None  # 进程内共享的调度器，见 get_scheduler_manager()
+    metrics_sampler = None    # 系统指标采样器，见 get_system_metrics_sampler()
     wechat_bot_manager = None
     logger = LogUtils.get_logger("Global")
@@ -0,0 +1,242 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from app.config.global_config import GlobalConfig
+from app.utils.write_buffer import WriteBuffer
+
+logger = logging.getLogger(__name__)
+
+# 旧版本保存在工作目录下的设置文件，首次启动时迁移到数据库
+LEGACY_SETTINGS_FILE = "settings.json"
+
+SettingSpec = namedtuple("SettingSpec", ["type", "default", "description", "category"])
+
+# 设置项定义：类型、默认值、描述、分类
+SETTINGS_SCHEMA = {
+    "theme": SettingSpec(str, "light", "应用主题(light/dark)", "appearance"),
+    "language": SettingSpec(str, "zh_CN", "界面语言", "locale"),
+    "window_width": SettingSpec(int, 1200, "窗口宽度", "window"),
+    "window_height": SettingSpec(int, 800, "窗口高度", "window"),
+    "opacity": SettingSpec(float, 1.0, "窗口透明度", "window"),
+    "app_title": SettingSpec(str, "Flet Application", "应用标题", "application"),
+    "auto_start": SettingSpec(bool, False, "开机自启", "system"),
+    "minimize_to_tray": SettingSpec(bool, True, "最小化到托盘", "system"),
+}
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def coerce_value(key, value, schema=SETTINGS_SCHEMA):
+    """
+    按设置项定义转换值的类型
+    未定义的设置项保持原值
+    """
+    spec = schema.get(key)
+    if spec is None or value is None or isinstance(value, spec.type):
+        return value
+    if spec.type is bool:
+        return str(value).strip().lower() in _TRUE_VALUES
+    if spec.type is int:
+        return int(float(value))
+    return spec.type(value)
+
+
+def serialize_value(value):
+    """将设置值转换为数据库中保存的字符串"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return None if value is None else str(value)
+
+
+class SettingsStore:
+    """
+    统一设置存储
+    所有设置保存在 system_configs 表中，读取返回类型化的只读快照，
+    写入先替换内存快照并通知订阅者，数据库写入合并后在后台完成
+    使用示例:
+        store = get_settings_store()
+        store.get("theme")
+        store.set("opacity", 0.8)
+        store.subscribe(lambda changes: ...)
+    """
+
+    def __init__(self, session_context_factory, schema=SETTINGS_SCHEMA, write_delay=0.5):
+        """
+        :param session_context_factory: 返回会话上下文管理器的函数，通常为 db_manager.get_session_context，
+                                        需支持 read_only 参数
+        :param schema: 设置项定义
+        :param write_delay: 数据库写入的合并等待时间（秒）
+        """
+        self.session_context_factory = session_context_factory
+        self.schema = schema
+        self._snapshot = MappingProxyType(
+            {key: spec.default for key, spec in schema.items()}
+        )
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._buffer = WriteBuffer(
+            self._write, delay=write_delay, max_wait=write_delay * 4, name="SettingsWriter"
+        )
+
+    # ---- 读取 ----
+    def snapshot(self):
+        """当前设置的只读快照，写入时整体替换，不会读到一半更新的状态"""
+        return self._snapshot
+
+    def get(self, key, default=None):
+        """获取设置值"""
+        return self._snapshot.get(key, default)
+
+    # ---- 写入 ----
+    def set(self, key, value):
+        """修改单个设置"""
+        return self.update({key: value})
+
+    def update(self, changes: dict):
+        """
+        修改多个设置
+        无法转换类型的值会被忽略并记录警告，该项保持原值（未设置过时为默认值）
+        :return: 实际发生变化的设置
+        """
+        changed = self._swap(changes)
+        if changed:
+            self._buffer.update({key: serialize_value(value) for key, value in changed.items()})
+            self._notify(changed)
+        return changed
+
+    def _swap(self, changes):
+        """合并变更并替换快照，返回实际变化的项"""
+        with self._lock:
+            current = self._snapshot
+            changed = {}
+            for key, value in changes.items():
+                try:
+                    value = coerce_value(key, value, self.schema)
+                except (TypeError, ValueError):
+                    logger.warning(f"设置值无效，已忽略: {key}={value!r}")
+                    continue
+                if current.get(key) != value or key not in current:
+                    changed[key] = value
+            if changed:
+                self._snapshot = MappingProxyType({**current, **changed})
+            return changed
+
+    # ---- 加载 ----
+    def load(self):
+        """从数据库加载设置，并迁移旧版 settings.json"""
+        from app.repository.system_config_repository import SystemConfigRepository
+
+        with self.session_context_factory(read_only=True) as session:
+            configs = SystemConfigRepository(session).get_all_configs()
+        self._swap(self._to_values(configs))
+        self._migrate_legacy_file()
+        return self._snapshot
+
+    def reload(self):
+        """
+        重新读取配置仓储（其他途径写入配置后调用），并通知发生变化的设置
+        """
+        from app.repository.system_config_repository import SystemConfigRepository
+
+        with self.session_context_factory(read_only=True) as session:
+            configs = SystemConfigRepository(session).get_all_configs()
+        changed = self._swap(self._to_values(configs))
+        if changed:
+            self._notify(changed)
+        return changed
+
+    def _to_values(self, configs):
+        values = {}
+        for config in configs:
+            try:
+                values[config["key"]] = coerce_value(config["key"], config["value"], self.schema)
+            except (TypeError, ValueError):
+                logger.warning(f"配置值无效，使用默认值: {config['key']}={config['value']!r}")
+        return values
+
+    def _migrate_legacy_file(self, path=LEGACY_SETTINGS_FILE):
+        """将旧版 settings.json 中的设置写入数据库，完成后重命名为 .bak"""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.warning(f"读取旧版设置文件失败，跳过迁移: {e}")
+            return
+        if isinstance(legacy, dict) and legacy:
+            self.update(legacy)
+            self.flush(wait=True)
+        os.replace(path, path + ".bak")
+        logger.info(f"已将 {path} 中的 {len(legacy)} 项设置迁移到数据库")
+
+    # ---- 订阅 ----
+    def subscribe(self, callback):
+        """
+        订阅设置变化
+        :param callback: 回调函数，签名为 callback(changes: dict)
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """取消订阅"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, changes):
+        for callback in list(self._listeners):
+            try:
+                callback(dict(changes))
+            except Exception as e:
+                logger.error(f"设置变化回调执行失败: {e}")
+
+    # ---- 持久化 ----
+    def flush(self, wait=False):
+        """立即写出尚未保存的设置"""
+        self._buffer.flush(wait=wait)
+
+    def close(self):
+        """写出剩余设置，应用退出时调用"""
+        self._buffer.close()
+
+    def _write(self, changes):
+        """将合并后的变更写入数据库"""
+        from app.repository.system_config_repository import SystemConfigRepository
+
+        configs = []
+        for key, value in changes.items():
+            spec = self.schema.get(key)
+            configs.append({
+                "config_key": key,
+                "config_value": value,
+                "description": spec.description if spec else key,
+                "category": spec.category if spec else "general",
+            })
+        with self.session_context_factory() as session:
+            # 已存在的配置只更新值，保留描述和分类
+            written = SystemConfigRepository(session).bulk_upsert_configs(
+                configs, update_fields=("config_value",)
+            )
+        if written is not None:
+            logger.debug(f"设置已写入数据库: {list(changes)}")
+
+
+def get_settings_store():
+    """
+    获取进程内共享的设置存储
+    首次调用时从数据库加载，要求数据库管理器已初始化
+    """
+    if GlobalConfig.settings_store is None:
+        if GlobalConfig.db_manager is None:
+            raise RuntimeError("数据库管理器尚未初始化")
+        store = SettingsStore(GlobalConfig.db_manager.get_session_context)
+        store.load()
+        atexit.register(store.close)
+        GlobalConfig.settings_store = store
+    return GlobalConfig.settings_store
@@ -0,0 +1,227 @@
+"""
+数据库迁移
+每个迁移包含一个版本号、同步执行的结构变更（加字段、建索引等）和可选的数据回填；
+结构变更在启动时按版本顺序执行，数据回填在后台线程中分批提交，不阻塞界面
+新增迁移时在 MIGRATIONS 末尾追加，版本号递增，已发布的迁移不要修改
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import func, inspect, insert, select, update
+from sqlalchemy.schema import CreateColumn
+
+from app.db.models import ExampleModel, SchemaMigration
+
+logger = logging.getLogger(__name__)
+
+Migration = namedtuple("Migration", ["version", "name", "upgrade", "backfill"])
+Migration.__new__.__defaults__ = (None,)  # backfill 可选
+Migration.__doc__ = """
+迁移定义
+:param version: 版本号，递增
+:param name: 迁移名称
+:param upgrade: 结构变更函数 upgrade(conn)，在一个事务中执行，需可重复执行
+:param backfill: 数据回填函数 backfill(conn, limit) -> 本批处理的行数，返回 0 表示完成
+"""
+
+
+# ---- 迁移辅助函数 ----
+def add_columns(conn, table, names):
+    """
+    为已存在的表添加字段，字段已存在时跳过
+    生成列以 VIRTUAL 方式添加（SQLite 的 ALTER TABLE 不支持 STORED）
+    """
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    for name in names:
+        if name in existing:
+            continue
+        ddl = CreateColumn(table.c[name]).compile(dialect=conn.dialect)
+        conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+        logger.info(f"已添加字段: {table.name}.{name}")
+
+
+def create_indexes(conn, table, names):
+    """创建模型中定义的索引，索引已存在时跳过"""
+    indexes = {index.name: index for index in table.indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+def backfill_in_chunks(table, column, value, where):
+    """
+    生成按主键分批更新的回填函数
+    :param table: 表
+    :param column: 要回填的字段名
+    :param value: 回填的值
+    :param where: 需要回填的行的条件
+    """
+    def backfill(conn, limit):
+        ids = select(table.c.id).where(where).limit(limit).scalar_subquery()
+        result = conn.execute(update(table).where(table.c.id.in_(ids)).values({column: value}))
+        return result.rowcount
+
+    return backfill
+
+
+# ---- 迁移列表 ----
+_example = ExampleModel.__table__
+
+
+def _example_keyset_indexes(conn):
+    """键集分页和状态/类型筛选使用的组合索引"""
+    create_indexes(conn, _example, ["ix_example_order", "ix_example_status_order", "ix_example_type_order"])
+
+
+def _example_schedule_columns(conn):
+    """从 settings 提取的调度生成列及其索引"""
+    add_columns(conn, _example, ["scheduled", "schedule_type", "schedule_cron", "schedule_interval"])
+    create_indexes(conn, _example, ["ix_example_scheduled"])
+
+
+MIGRATIONS = [
+    Migration(1, "example_keyset_indexes", _example_keyset_indexes),
+    Migration(2, "example_schedule_columns", _example_schedule_columns),
+]
+
+
+class MigrationRunner:
+    """
+    迁移执行器
+    使用示例:
+        runner = MigrationRunner(engine)
+        runner.upgrade()          # 启动时执行未完成的结构变更
+        runner.start_backfills()  # 后台分批回填数据
+    """
+
+    def __init__(self, engine, migrations=MIGRATIONS, batch_size=1000, pause=0.05):
+        """
+        :param engine: 写引擎
+        :param migrations: 迁移列表
+        :param batch_size: 回填时每个事务处理的行数
+        :param pause: 回填批次之间的间隔（秒），让出写连接给界面
+        """
+        self.engine = engine
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = batch_size
+        self.pause = pause
+        self._table = SchemaMigration.__table__
+        self._stopped = threading.Event()
+        self._backfill_thread = None
+
+    @property
+    def latest_version(self):
+        return self.migrations[-1].version if self.migrations else 0
+
+    def _records(self):
+        self._table.create(self.engine, checkfirst=True)
+        with self.engine.connect() as conn:
+            return {row.version: row for row in conn.execute(select(self._table))}
+
+    def current_version(self):
+        """已完成结构变更的最大版本号"""
+        return max(self._records(), default=0)
+
+    def stamp(self):
+        """
+        将所有迁移标记为已完成，用于刚由 create_all 创建的新数据库
+        """
+        records = self._records()
+        missing = [m for m in self.migrations if m.version not in records]
+        if not missing:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(insert(self._table), [
+                {"version": m.version, "name": m.name, "duration_ms": 0.0} for m in missing
+            ])
+            # 新数据库没有需要回填的数据
+            conn.execute(
+                update(self._table)
+                .where(self._table.c.version.in_([m.version for m in missing if m.backfill]))
+                .values(backfill_rows=0, backfill_ms=0.0, backfilled_at=func.now())
+            )
+
+    def upgrade(self):
+        """
+        按版本顺序执行未完成的结构变更，每个迁移一个事务
+        :return: 本次执行的迁移 [(版本号, 名称, 耗时毫秒)]
+        """
+        records = self._records()
+        applied = []
+        for migration in self.migrations:
+            if migration.version in records:
+                continue
+            started = time.perf_counter()
+            with self.engine.begin() as conn:
+                migration.upgrade(conn)
+                duration_ms = (time.perf_counter() - started) * 1000
+                conn.execute(insert(self._table).values(
+                    version=migration.version, name=migration.name, duration_ms=duration_ms
+                ))
+            logger.info(f"数据库迁移完成: v{migration.version} {migration.name} ({duration_ms:.1f}ms)")
+            applied.append((migration.version, migration.name, duration_ms))
+        return applied
+
+    def pending_backfills(self):
+        """结构变更已完成但数据尚未回填的迁移"""
+        records = self._records()
+        return [
+            m for m in self.migrations
+            if m.backfill and m.version in records and records[m.version].backfilled_at is None
+        ]
+
+    def start_backfills(self):
+        """在后台线程中执行数据回填"""
+        pending = self.pending_backfills()
+        if not pending or self._backfill_thread is not None:
+            return None
+        self._stopped.clear()
+        self._backfill_thread = threading.Thread(
+            target=self.run_backfills, args=(pending,), name="MigrationBackfill", daemon=True
+        )
+        self._backfill_thread.start()
+        return self._backfill_thread
+
+    def run_backfills(self, pending=None):
+        """依次执行数据回填，每批一个事务，停止后下次启动继续"""
+        for migration in pending if pending is not None else self.pending_backfills():
+            started = time.perf_counter()
+            total = 0
+            while not self._stopped.is_set():
+                with self.engine.begin() as conn:
+                    count = migration.backfill(conn, self.batch_size)
+                total += count
+                if count < self.batch_size:
+                    break
+                self._stopped.wait(self.pause)
+            else:
+                logger.info(f"数据回填已中断: v{migration.version} {migration.name}, 已处理 {total} 行")
+                return
+            backfill_ms = (time.perf_counter() - started) * 1000
+            with self.engine.begin() as conn:
+                conn.execute(
+                    update(self._table)
+                    .where(self._table.c.version == migration.version)
+                    .values(
+                        backfill_rows=func.coalesce(self._table.c.backfill_rows, 0) + total,
+                        backfill_ms=func.coalesce(self._table.c.backfill_ms, 0) + backfill_ms,
+                        backfilled_at=func.now(),
+                    )
+                )
+            logger.info(
+                f"数据回填完成: v{migration.version} {migration.name}, {total} 行 ({backfill_ms:.1f}ms)"
+            )
+
+    def stop(self, timeout=5):
+        """停止后台回填，当前批次提交后退出"""
+        self._stopped.set()
+        if self._backfill_thread is not None:
+            self._backfill_thread.join(timeout=timeout)
+            self._backfill_thread = None
+
+    def report(self):
+        """迁移记录，按版本号排序"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(self._table).order_by(self._table.c.version))
+            return [dict(row._mapping) for row in rows]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, func
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Text, JSON, Float, LargeBinary, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -6,6 +6,9 @@ Base = declarative_base()
 __all__ = [
     "SystemConfig",  # 系统配置表
     "ExampleModel",  # 示例模型
+    "SchedulerJob",  # 定时任务持久化表
+    "JobRunHistory",  # 任务执行记录
+    "SchemaMigration",  # 数据库迁移记录
 ]
 
 
@@ -35,6 +38,14 @@ class ExampleModel(Base):
     演示基本的数据库表结构定义
     """
     __tablename__ = 'example'
+    __table_args__ = (
+        # 键集分页按 (order_index, id) 排序，状态/类型筛选后同样可以走索引
+        Index('ix_example_order', 'order_index', 'id'),
+        Index('ix_example_status_order', 'status', 'order_index', 'id'),
+        Index('ix_example_type_order', 'type', 'order_index', 'id'),
+        # 定时任务查询走索引，不再扫描 settings JSON
+        Index('ix_example_scheduled', 'scheduled', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, comment='ID')
     name = Column(String(100), nullable=False, comment='名称')
@@ -47,12 +58,33 @@ class ExampleModel(Base):
     created_at = Column(DateTime, default=func.now(), comment='创建时间')
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment='更新时间')
 
+    # 从 settings 中提取的调度字段（虚拟生成列，只读，由数据库根据 settings 计算）
+    scheduled = Column(Integer, Computed("json_extract(settings, '$.scheduled')", persisted=False),
+                       comment='是否定时执行(settings.scheduled)')
+    schedule_type = Column(String(20), Computed("json_extract(settings, '$.schedule.type')", persisted=False),
+                           comment='调度类型(settings.schedule.type)')
+    schedule_cron = Column(String(100), Computed("json_extract(settings, '$.schedule.cron')", persisted=False),
+                           comment='cron 表达式(settings.schedule.cron)')
+    schedule_interval = Column(
+        Float,
+        Computed(
+            "coalesce(json_extract(settings, '$.schedule.seconds'), 0)"
+            " + coalesce(json_extract(settings, '$.schedule.minutes'), 0) * 60"
+            " + coalesce(json_extract(settings, '$.schedule.hours'), 0) * 3600",
+            persisted=False,
+        ),
+        comment='执行间隔秒数(settings.schedule.seconds/minutes/hours)',
+    )
+
     def __repr__(self):
         return f"<ExampleModel(id={self.id}, name={self.name})>"
 
-    def to_dict(self):
-        """转换为字典"""
-        return {
+    def to_dict(self, columns=None):
+        """
+        转换为字典
+        :param columns: 需要的字段名，为空时返回全部字段
+        """
+        data = {
             "id": self.id,
             "name": self.name,
             "description": self.description,
@@ -62,8 +94,73 @@ class ExampleModel(Base):
             "settings": self.settings,
             "metadata_info": self.metadata_info,
             "created_at": self.created_at,
-            "updated_at": self.updated_at
+            "updated_at": self.updated_at,
+            "scheduled": self.scheduled,
+            "schedule_type": self.schedule_type,
+            "schedule_cron": self.schedule_cron,
+            "schedule_interval": self.schedule_interval,
         }
+        if columns:
+            return {key: data[key] for key in columns}
+        return data
+
+
+class SchedulerJob(Base):
+    """
+    定时任务持久化表
+    由 PersistentJobStore 维护，保存 APScheduler 任务的序列化状态
+    """
+    __tablename__ = 'scheduler_jobs'
+
+    id = Column(String(191), primary_key=True, comment='任务ID')
+    next_run_time = Column(Float, nullable=True, index=True, comment='下次执行时间(UTC时间戳,暂停时为空)')
+    job_state = Column(LargeBinary, nullable=False, comment='任务状态(pickle)')
+
+    def __repr__(self):
+        return f"<SchedulerJob(id={self.id}, next_run_time={self.next_run_time})>"
+
+
+class JobRunHistory(Base):
+    """
+    任务执行记录表
+    由 JobMetrics 批量写入，记录每次执行的耗时、延迟和结果
+    """
+    __tablename__ = 'job_run_history'
+    __table_args__ = (
+        Index('ix_job_run_history_job_finished', 'job_id', 'finished_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='ID')
+    job_id = Column(String(191), nullable=False, comment='任务ID')
+    status = Column(String(20), nullable=False, comment='结果(success/error/missed)')
+    scheduled_at = Column(Float, nullable=True, comment='计划执行时间(UTC时间戳)')
+    finished_at = Column(Float, nullable=False, comment='完成时间(UTC时间戳)')
+    duration_ms = Column(Float, nullable=True, comment='耗时(毫秒,含排队时间)')
+    lateness_ms = Column(Float, nullable=True, comment='提交时相对计划时间的延迟(毫秒)')
+    concurrency = Column(Integer, nullable=True, comment='提交时正在执行的任务数')
+    error = Column(Text, nullable=True, comment='异常信息')
+
+    def __repr__(self):
+        return f"<JobRunHistory(job_id={self.job_id}, status={self.status})>"
+
+
+class SchemaMigration(Base):
+    """
+    数据库迁移记录表
+    由 app.db.migrations.MigrationRunner 维护，记录每个版本的执行时间和耗时
+    """
+    __tablename__ = 'schema_migrations'
+
+    version = Column(Integer, primary_key=True, autoincrement=False, comment='迁移版本号')
+    name = Column(String(100), nullable=False, comment='迁移名称')
+    applied_at = Column(DateTime, default=func.now(), comment='结构变更完成时间')
+    duration_ms = Column(Float, nullable=True, comment='结构变更耗时(毫秒)')
+    backfill_rows = Column(Integer, nullable=True, comment='数据回填行数')
+    backfill_ms = Column(Float, nullable=True, comment='数据回填耗时(毫秒)')
+    backfilled_at = Column(DateTime, nullable=True, comment='数据回填完成时间(无需回填时为空)')
+
+    def __repr__(self):
+        return f"<SchemaMigration(version={self.version}, name={self.name})>"
 
 
 # 系统配置的默认值
@@ -0,0 +1,72 @@
+import logging
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# SQLite 连接参数默认值，可在 settings.toml 的 [database] 中覆盖
+DEFAULT_PROFILE = {
+    "journal_mode": "WAL",       # 读写互不阻塞
+    "synchronous": "NORMAL",     # WAL 模式下只在检查点时 fsync
+    "mmap_size": 268435456,      # 256MB 内存映射读取
+    "cache_size": -64000,        # 负数表示 KB，即约 64MB 页缓存
+    "temp_store": "MEMORY",      # 临时表和索引放在内存中
+    "busy_timeout": 5000,        # 数据库被锁定时等待的毫秒数
+}
+
+# 允许的取值，防止配置错误拼接出非法的 PRAGMA 语句
+_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+
+def load_profile(settings):
+    """
+    从配置中读取 SQLite 连接参数
+    :param settings: Dynaconf 配置对象，读取 database.<参数名>
+    :return: 参数字典，未配置的项使用默认值
+    """
+    return {
+        name: settings.get(f"database.{name}", default)
+        for name, default in DEFAULT_PROFILE.items()
+    }
+
+
+def _pragma_statements(profile):
+    statements = []
+    for name, value in profile.items():
+        if value is None:
+            continue
+        if name in _CHOICES:
+            value = str(value).upper()
+            if value not in _CHOICES[name]:
+                raise ValueError(f"无效的 SQLite 参数: {name}={value}")
+        elif name in DEFAULT_PROFILE:
+            value = int(value)
+        else:
+            raise ValueError(f"不支持的 SQLite 参数: {name}")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def apply_profile(engine, profile):
+    """
+    在引擎的每个新连接上执行 PRAGMA
+    :param engine: SQLAlchemy 引擎
+    :param profile: 参数字典，值为 None 的项保持 SQLite 默认
+    """
+    statements = _pragma_statements(profile)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    logger.debug(f"SQLite 连接参数: {'; '.join(statements)}")
+    return statements
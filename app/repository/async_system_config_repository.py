@@ -0,0 +1,165 @@
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import SystemConfig
+from app.repository.system_config_repository import (
+    SystemConfigRepository,
+    _FIELD_MAP,
+    _upsert_statements,
+)
+
+
+class AsyncSystemConfigRepository:
+    """
+    系统配置异步仓储类
+    基于 SQLAlchemy asyncio 扩展和 aiosqlite，供 Flet 异步事件处理函数使用；
+    与 SystemConfigRepository 共享同一个配置缓存，两者的写入互相可见；
+    db_manager.get_async_session 返回的会话只读，应用内的写入通过 SystemConfigViewModel 在线程中使用写会话完成
+    """
+
+    _cache = SystemConfigRepository._cache
+    _to_dict = staticmethod(SystemConfigRepository._to_dict)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _ensure_cache(self):
+        """缓存失效时从数据库加载全部配置"""
+        if self._cache.is_valid():
+            return
+        version = self._cache.version
+        result = await self.session.execute(select(SystemConfig).order_by(SystemConfig.id))
+        self._cache.load([self._to_dict(config) for config in result.scalars()], version)
+
+    async def get_all_configs(self):
+        """
+        获取所有系统配置
+        :return: 配置列表
+        """
+        try:
+            await self._ensure_cache()
+            return self._cache.values()
+        except Exception as e:
+            print(f"获取系统配置失败: {e}")
+            return []
+
+    async def get_configs_by_category(self, category: str):
+        """
+        获取指定分类的配置
+        :param category: 配置分类
+        :return: 配置列表
+        """
+        try:
+            await self._ensure_cache()
+            return [config for config in self._cache.values() if config["category"] == category]
+        except Exception as e:
+            print(f"获取分类配置失败: {category}, 错误: {e}")
+            return []
+
+    async def get_config_by_key(self, config_key: str):
+        """
+        根据键获取配置
+        :param config_key: 配置键
+        :return: 配置项或 None
+        """
+        try:
+            await self._ensure_cache()
+            return self._cache.get(config_key)
+        except Exception as e:
+            print(f"获取配置失败: {config_key}, 错误: {e}")
+            return None
+
+    async def add_config(self, config_data: dict):
+        """
+        新增配置
+        :param config_data: 配置数据字典
+        :return: 新配置或 None
+        """
+        try:
+            new_config = SystemConfig(**config_data)
+            self.session.add(new_config)
+            await self.session.commit()
+            result = self._to_dict(new_config)
+            self._cache.put(result)
+            return result
+        except Exception as e:
+            await self.session.rollback()
+            self._cache.invalidate()
+            print(f"新增配置失败: {e}")
+            return None
+
+    async def update_config(self, config_key: str, updates: dict):
+        """
+        更新配置
+        :param config_key: 配置键
+        :param updates: 更新的字段和值
+        :return: 更新后的配置或 None
+        """
+        try:
+            await self._ensure_cache()
+            cached = self._cache.get(config_key)
+            if cached:
+                values = {key: value for key, value in updates.items() if key in _FIELD_MAP}
+                if values:
+                    await self.session.execute(
+                        update(SystemConfig).where(SystemConfig.config_key == config_key).values(**values)
+                    )
+                    await self.session.commit()
+                    if "config_key" in values:
+                        self._cache.remove(config_key)
+                    cached.update({_FIELD_MAP[key]: value for key, value in values.items()})
+                    self._cache.put(cached)
+                print(f"配置已更新: {config_key}")
+                return cached
+            print(f"配置不存在: {config_key}")
+            return None
+        except Exception as e:
+            await self.session.rollback()
+            self._cache.invalidate()
+            print(f"更新配置失败: {config_key}, 错误: {e}")
+            return None
+
+    async def delete_config(self, config_key: str):
+        """
+        删除配置
+        :param config_key: 配置键
+        :return: 是否成功
+        """
+        try:
+            await self._ensure_cache()
+            if self._cache.get(config_key):
+                await self.session.execute(
+                    delete(SystemConfig).where(SystemConfig.config_key == config_key)
+                )
+                await self.session.commit()
+                self._cache.remove(config_key)
+                print(f"配置已删除: {config_key}")
+                return True
+            print(f"配置不存在: {config_key}")
+            return False
+        except Exception as e:
+            await self.session.rollback()
+            self._cache.invalidate()
+            print(f"删除配置失败: {config_key}, 错误: {e}")
+            return False
+
+    async def bulk_upsert_configs(self, configs, update_fields=None):
+        """
+        批量新增或更新配置，参数和返回值与 SystemConfigRepository.bulk_upsert_configs 相同
+        """
+        if not configs:
+            return 0
+        returning = self.session.bind.dialect.insert_returning
+        written = []
+        try:
+            for stmt in _upsert_statements(configs, update_fields, returning):
+                result = await self.session.execute(stmt)
+                if returning:
+                    written.extend(result.mappings().all())
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            self._cache.invalidate()
+            print(f"批量写入配置失败: {e}")
+            return None
+        return SystemConfigRepository._cache_upserted(written, returning, len(configs))
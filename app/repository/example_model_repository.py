@@ -0,0 +1,113 @@
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.db.models import ExampleModel
+
+# 可查询的字段
+COLUMNS = tuple(column.name for column in ExampleModel.__table__.columns)
+
+
+class ExampleModelRepository:
+    """
+    示例模型仓储类
+    分页使用 (order_index, id) 键集分页，翻页耗时与页码无关；
+    大表通过 iter_all 分批流式读取，内存占用与表大小无关
+    读取建议使用只读会话：db_manager.get_session(read_only=True)
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_by_id(self, item_id: int, columns=None):
+        """
+        根据 ID 获取数据
+        :param columns: 需要的字段名，为空时返回全部字段
+        :return: 字典或 None
+        """
+        query = select(*self._columns(columns)).where(ExampleModel.id == item_id)
+        row = self.session.execute(query).mappings().first()
+        return dict(row) if row else None
+
+    def count(self, status=None, type=None):
+        """统计数量"""
+        query = select(func.count()).select_from(ExampleModel)
+        query = self._filter(query, status, type)
+        return self.session.execute(query).scalar_one()
+
+    def get_page(self, after=None, limit=50, status=None, type=None, columns=None):
+        """
+        按 (order_index, id) 顺序获取一页数据
+        :param after: 上一页返回的游标，为空时从头开始
+        :param limit: 每页数量
+        :param status: 按状态筛选
+        :param type: 按类型筛选
+        :param columns: 需要的字段名，为空时返回全部字段；游标所需的 order_index 和 id 总会查询
+        :return: (数据列表, 下一页游标)，没有更多数据时游标为 None
+        """
+        requested = list(columns) if columns else list(COLUMNS)
+        selected = requested + [key for key in ("order_index", "id") if key not in requested]
+
+        query = select(*self._columns(selected))
+        query = self._filter(query, status, type)
+        if after is not None:
+            query = query.where(self._after(after))
+        query = query.order_by(ExampleModel.order_index, ExampleModel.id).limit(limit)
+
+        rows = self.session.execute(query).mappings().all()
+        if not rows:
+            return [], None
+        last = rows[-1]
+        next_cursor = (last["order_index"], last["id"]) if len(rows) == limit else None
+        return [{key: row[key] for key in requested} for row in rows], next_cursor
+
+    def get_scheduled(self, columns=("id", "name", "schedule_type", "schedule_cron", "schedule_interval")):
+        """
+        获取需要定时执行的数据，通过 scheduled 生成列的索引查询
+        :param columns: 需要的字段名
+        """
+        query = (
+            select(*self._columns(columns))
+            .where(ExampleModel.scheduled == 1)
+            .order_by(ExampleModel.id)
+        )
+        return [dict(row) for row in self.session.execute(query).mappings()]
+
+    def iter_all(self, batch_size=500, status=None, type=None, columns=None):
+        """
+        分批流式遍历数据，每次只在内存中保留一批
+        :param batch_size: 每批数量
+        """
+        cursor = None
+        while True:
+            items, cursor = self.get_page(cursor, batch_size, status, type, columns)
+            yield from items
+            if cursor is None:
+                break
+
+    @staticmethod
+    def _columns(columns):
+        names = columns or COLUMNS
+        unknown = [name for name in names if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"未知字段: {unknown}")
+        table = ExampleModel.__table__
+        return [table.c[name] for name in names]
+
+    @staticmethod
+    def _filter(query, status, type):
+        if status is not None:
+            query = query.where(ExampleModel.status == status)
+        if type is not None:
+            query = query.where(ExampleModel.type == type)
+        return query
+
+    @staticmethod
+    def _after(cursor):
+        """游标之后的条件，order_index 为空的行排在最前"""
+        order_index, item_id = cursor
+        if order_index is None:
+            return or_(
+                and_(ExampleModel.order_index.is_(None), ExampleModel.id > item_id),
+                ExampleModel.order_index.is_not(None),
+            )
+        return tuple_(ExampleModel.order_index, ExampleModel.id) > (order_index, item_id)
@@ -1,15 +1,160 @@
+import threading
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 from app.db.models import SystemConfig
 
+# 模型字段 -> 配置字典字段
+_FIELD_MAP = {
+    "config_key": "key",
+    "config_value": "value",
+    "description": "description",
+    "category": "category",
+    "enable": "enable",
+}
+
+# 批量写入时每条语句包含的行数，避免超出 SQLite 单条语句的参数上限
+_UPSERT_CHUNK_SIZE = 150
+
+
+def _upsert_statements(configs, update_fields=None, returning=False):
+    """
+    生成批量写入配置的 INSERT ... ON CONFLICT(config_key) 语句，同步和异步仓储共用
+    :param update_fields: 见 SystemConfigRepository.bulk_upsert_configs
+    :param returning: 是否返回实际写入的行
+    """
+    if update_fields is not None:
+        yield from _upsert_chunks(configs, update_fields, returning)
+        return
+    # 未指定更新字段时按传入的字段分组，每组只更新本组传入的字段，
+    # 避免缺少某个字段的配置把已有的值覆盖为空
+    groups = {}
+    for config in configs:
+        columns = tuple(key for key in _FIELD_MAP if key in config and key != "config_key")
+        groups.setdefault(columns, []).append(config)
+    for columns, group in groups.items():
+        yield from _upsert_chunks(group, columns, returning)
+
+
+def _upsert_chunks(configs, update_fields, returning):
+    """按 _UPSERT_CHUNK_SIZE 分批生成写入语句"""
+    rows = [
+        {
+            "config_key": config["config_key"],
+            "config_value": config.get("config_value"),
+            "description": config.get("description"),
+            "category": config.get("category"),
+            "enable": config.get("enable", 1),
+        }
+        for config in configs
+    ]
+    table = SystemConfig.__table__
+    for i in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+        stmt = insert(table).values(rows[i:i + _UPSERT_CHUNK_SIZE])
+        if update_fields:
+            set_ = {key: stmt.excluded[key] for key in update_fields}
+            set_["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=[table.c.config_key], set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[table.c.config_key])
+        if returning:
+            stmt = stmt.returning(*(table.c[key] for key in ("id", *_FIELD_MAP)))
+        yield stmt
+
+
+class ConfigCache:
+    """
+    系统配置缓存
+    按 config_key 索引，所有仓储实例共享；
+    version 与 loaded_version 一致时缓存有效，invalidate() 使其在下次读取时重新加载
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.RLock()
+        self.version = 0           # 每次写入或失效时递增
+        self.loaded_version = -1   # 缓存内容对应的版本
+
+    def is_valid(self):
+        return self.loaded_version == self.version
+
+    def load(self, configs, version):
+        """
+        用数据库中的全部配置填充缓存
+        :param version: 开始查询前读取的 version；查询期间有写入或失效时版本不一致，缓存保持失效
+        """
+        with self._lock:
+            self._entries = {config["key"]: config for config in configs}
+            self.loaded_version = version
+
+    def values(self):
+        with self._lock:
+            return [dict(config) for config in self._entries.values()]
+
+    def get(self, config_key):
+        with self._lock:
+            config = self._entries.get(config_key)
+            return dict(config) if config else None
+
+    def put(self, config):
+        """写入一条配置，缓存有效时保持有效"""
+        with self._lock:
+            valid = self.is_valid()
+            self._entries[config["key"]] = dict(config)
+            self.version += 1
+            if valid:
+                self.loaded_version = self.version
+
+    def remove(self, config_key):
+        """移除一条配置，缓存有效时保持有效"""
+        with self._lock:
+            valid = self.is_valid()
+            self._entries.pop(config_key, None)
+            self.version += 1
+            if valid:
+                self.loaded_version = self.version
+
+    def invalidate(self):
+        """使缓存失效，下次读取时从数据库重新加载"""
+        with self._lock:
+            self.version += 1
+
 
 class SystemConfigRepository:
     """
     系统配置仓储类
     负责系统配置的数据访问操作
+    读取走共享的内存缓存，写入先提交数据库再同步更新缓存
     """
 
-    def __init__(self, session: Session):
+    _cache = ConfigCache()
+
+    def __init__(self, session: Session, read_session: Session = None):
+        """
+        :param session: 写入使用的会话
+        :param read_session: 加载缓存使用的只读会话，为空时使用 session
+        """
         self.session = session
+        self.read_session = read_session
+
+    def _ensure_cache(self):
+        """缓存失效时从数据库加载全部配置"""
+        if self._cache.is_valid():
+            return
+        session = self.read_session or self.session
+        in_transaction = session.in_transaction()
+        version = self._cache.version
+        configs = session.query(SystemConfig).order_by(SystemConfig.id).all()
+        self._cache.load([self._to_dict(config) for config in configs], version)
+        if not in_transaction:
+            # 结束查询自动开启的事务，及时归还连接
+            session.commit()
+
+    @classmethod
+    def invalidate_cache(cls):
+        """使配置缓存失效，数据库被其他途径修改后调用"""
+        cls._cache.invalidate()
 
     def get_all_configs(self):
         """
@@ -17,8 +162,8 @@ class SystemConfigRepository:
         :return: 配置列表
         """
         try:
-            configs = self.session.query(SystemConfig).all()
-            return [self._to_dict(config) for config in configs]
+            self._ensure_cache()
+            return self._cache.values()
         except Exception as e:
             print(f"获取系统配置失败: {e}")
             return []
@@ -30,8 +175,8 @@ class SystemConfigRepository:
         :return: 配置列表
         """
         try:
-            configs = self.session.query(SystemConfig).filter_by(category=category).all()
-            return [self._to_dict(config) for config in configs]
+            self._ensure_cache()
+            return [config for config in self._cache.values() if config["category"] == category]
         except Exception as e:
             print(f"获取分类配置失败: {category}, 错误: {e}")
             return []
@@ -43,8 +188,8 @@ class SystemConfigRepository:
         :return: 配置项或 None
         """
         try:
-            config = self.session.query(SystemConfig).filter_by(config_key=config_key).first()
-            return self._to_dict(config) if config else None
+            self._ensure_cache()
+            return self._cache.get(config_key)
         except Exception as e:
             print(f"获取配置失败: {config_key}, 错误: {e}")
             return None
@@ -59,9 +204,12 @@ class SystemConfigRepository:
             new_config = SystemConfig(**config_data)
             self.session.add(new_config)
             self.session.commit()
-            return self._to_dict(new_config)
+            result = self._to_dict(new_config)
+            self._cache.put(result)
+            return result
         except Exception as e:
             self.session.rollback()
+            self._cache.invalidate()
             print(f"新增配置失败: {e}")
             return None
 
@@ -73,18 +221,26 @@ class SystemConfigRepository:
         :return: 更新后的配置或 None
         """
         try:
-            config = self.session.query(SystemConfig).filter_by(config_key=config_key).first()
-            if config:
-                for key, value in updates.items():
-                    if hasattr(config, key):
-                        setattr(config, key, value)
-                self.session.commit()
+            self._ensure_cache()
+            cached = self._cache.get(config_key)
+            if cached:
+                values = {key: value for key, value in updates.items() if key in _FIELD_MAP}
+                if values:
+                    self.session.query(SystemConfig).filter_by(config_key=config_key).update(
+                        values, synchronize_session=False
+                    )
+                    self.session.commit()
+                    if "config_key" in values:
+                        self._cache.remove(config_key)
+                    cached.update({_FIELD_MAP[key]: value for key, value in values.items()})
+                    self._cache.put(cached)
                 print(f"配置已更新: {config_key}")
-                return self._to_dict(config)
+                return cached
             print(f"配置不存在: {config_key}")
             return None
         except Exception as e:
             self.session.rollback()
+            self._cache.invalidate()
             print(f"更新配置失败: {config_key}, 错误: {e}")
             return None
 
@@ -95,35 +251,73 @@ class SystemConfigRepository:
         :return: 是否成功
         """
         try:
-            config = self.session.query(SystemConfig).filter_by(config_key=config_key).first()
-            if config:
-                self.session.delete(config)
+            self._ensure_cache()
+            if self._cache.get(config_key):
+                self.session.query(SystemConfig).filter_by(config_key=config_key).delete(
+                    synchronize_session=False
+                )
                 self.session.commit()
+                self._cache.remove(config_key)
                 print(f"配置已删除: {config_key}")
                 return True
             print(f"配置不存在: {config_key}")
             return False
         except Exception as e:
             self.session.rollback()
+            self._cache.invalidate()
             print(f"删除配置失败: {config_key}, 错误: {e}")
             return False
 
-    def init_default_configs(self):
+    def bulk_upsert_configs(self, configs, update_fields=None):
         """
-        初始化默认配置
-        从 models.py 中的 DEFAULT_CONFIGS 初始化系统配置
+        批量新增或更新配置
+        使用 INSERT ... ON CONFLICT(config_key)，所有配置在一个事务中写入
+        :param configs: 配置数据字典列表，字段名与模型一致
+        :param update_fields: 配置已存在时更新的字段，为空时更新每条配置传入的字段，空元组表示保留已有配置
+        :return: 写入的配置数量，失败时返回 None
         """
+        if not configs:
+            return 0
+        returning = self.session.get_bind().dialect.insert_returning
+        written = []
         try:
-            from app.db.models import DEFAULT_CONFIGS
-            for config in DEFAULT_CONFIGS:
-                existing = self.get_config_by_key(config["config_key"])
-                if not existing:
-                    self.add_config(config)
-            print("默认配置已初始化")
-            return True
+            for stmt in _upsert_statements(configs, update_fields, returning):
+                result = self.session.execute(stmt)
+                if returning:
+                    written.extend(result.mappings().all())
+            self.session.commit()
         except Exception as e:
-            print(f"初始化默认配置失败: {e}")
+            self.session.rollback()
+            self._cache.invalidate()
+            print(f"批量写入配置失败: {e}")
+            return None
+        return self._cache_upserted(written, returning, len(configs))
+
+    @classmethod
+    def _cache_upserted(cls, written, returning, count):
+        """批量写入后更新缓存，返回写入的配置数量"""
+        if not returning:
+            cls._cache.invalidate()
+            return count
+        # 只有实际写入的行会被返回，已存在且未更新的配置保持缓存不变
+        for row in written:
+            config = {"id": row["id"]}
+            config.update({name: row[key] for key, name in _FIELD_MAP.items()})
+            cls._cache.put(config)
+        return len(written)
+
+    def init_default_configs(self):
+        """
+        初始化默认配置
+        从 models.py 中的 DEFAULT_CONFIGS 初始化系统配置，已存在的配置保持不变
+        """
+        from app.db.models import DEFAULT_CONFIGS
+
+        if self.bulk_upsert_configs(DEFAULT_CONFIGS, update_fields=()) is None:
+            print("初始化默认配置失败")
             return False
+        print("默认配置已初始化")
+        return True
 
     @staticmethod
     def _to_dict(config: SystemConfig):
@@ -1,42 +1,172 @@
+import atexit
 import logging
-from apscheduler.executors.pool import ThreadPoolExecutor
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy.orm import Session
-from app.db.models import ExampleModel
+import os
+import pickle
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING
+
+from app.config.global_config import GlobalConfig
+from app.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+# apscheduler 在创建调度器时才加载
+apscheduler_pool = lazy_import("apscheduler.executors.pool")
+apscheduler_background = lazy_import("apscheduler.schedulers.background")
+apscheduler_cron = lazy_import("apscheduler.triggers.cron")
+apscheduler_interval = lazy_import("apscheduler.triggers.interval")
+apscheduler_date = lazy_import("apscheduler.triggers.date")
+apscheduler_events = lazy_import("apscheduler.events")
+apscheduler_util = lazy_import("apscheduler.util")
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_instance_lock = threading.Lock()
+_scheduler_logger = logging.getLogger("apscheduler.scheduler")  # BackgroundScheduler 的默认日志记录器
+
+
+def get_scheduler_manager():
+    """
+    获取进程内共享的调度器
+    所有视图和视图模型共用同一个调度器及其线程池
+    """
+    if GlobalConfig.scheduler_manager is None:
+        with _instance_lock:
+            if GlobalConfig.scheduler_manager is None:
+                db_manager = GlobalConfig.db_manager
+                GlobalConfig.scheduler_manager = SchedulerManager(
+                    engine=db_manager.engine if db_manager else None,
+                    read_engine=db_manager.read_engine if db_manager else None,
+                )
+                atexit.register(shutdown_scheduler_manager)
+                logger.info("共享调度器已创建")
+    return GlobalConfig.scheduler_manager
+
+
+def shutdown_scheduler_manager():
+    """停止共享调度器，在应用退出时调用"""
+    with _instance_lock:
+        manager = GlobalConfig.scheduler_manager
+        GlobalConfig.scheduler_manager = None
+    if manager is not None:
+        manager.stop()
+
+
+class _ThreadLogFilter(logging.Filter):
+    """只屏蔽指定线程中低于指定级别的日志"""
+
+    def __init__(self, thread_id, level):
+        super().__init__()
+        self.thread_id = thread_id
+        self.level = level
+
+    def filter(self, record):
+        return record.thread != self.thread_id or record.levelno >= self.level
+
 
 class SchedulerManager:
     """
     通用任务调度管理器
     用于管理定时任务和周期性任务
+    应用内请通过 get_scheduler_manager() 获取共享实例
     """
 
-    def __init__(self, max_threads=10):
-        # 配置调度器的执行器
+    # 执行方式 -> 执行器别名
+    EXECUTOR_THREAD = "thread"      # 线程池，适合 I/O 密集型任务
+    EXECUTOR_PROCESS = "process"    # 进程池，适合 CPU 密集型任务
+    EXECUTOR_ASYNCIO = "asyncio"    # 独立事件循环，适合协程任务
+    EXECUTORS = {
+        EXECUTOR_THREAD: "default",
+        EXECUTOR_PROCESS: "process",
+        EXECUTOR_ASYNCIO: "asyncio",
+    }
+
+    def __init__(self, max_threads=10, engine=None, max_processes=None, read_engine=None):
+        """
+        :param max_threads: 线程池大小
+        :param engine: SQLAlchemy 引擎，提供时任务持久化到数据库，重启后自动恢复
+        :param read_engine: 只读引擎，用于启动时恢复任务，为空时使用 engine
+        :param max_processes: 进程池大小，默认为 CPU 核心数
+        """
+        from app.tasks.executors import AsyncioLoopExecutor
+        from app.tasks.job_metrics import JobMetrics
+
+        # 配置调度器的执行器，进程池在首次提交任务时才创建工作进程
         executors = {
-            'default': ThreadPoolExecutor(max_threads)
+            'default': apscheduler_pool.ThreadPoolExecutor(max_threads),
+            'process': apscheduler_pool.ProcessPoolExecutor(max_processes or os.cpu_count() or 1),
+            'asyncio': AsyncioLoopExecutor(),
         }
-        self.scheduler = BackgroundScheduler(executors=executors)
+        jobstores = {}
+        self.job_store = None  # 持久化任务存储，未传入 engine 时为空
+        if engine is not None:
+            from app.tasks.job_store import PersistentJobStore
+
+            self.job_store = jobstores['default'] = PersistentJobStore(engine, read_engine=read_engine)
+        self.scheduler = apscheduler_background.BackgroundScheduler(
+            executors=executors, jobstores=jobstores
+        )
+        self._listeners = []  # 已订阅的调度器事件回调
+        self._result_callbacks = {}  # job_id -> 结果回调
+        self._result_dispatcher = None
+        self.scheduler.add_listener(
+            self._dispatch_result,
+            apscheduler_events.EVENT_JOB_EXECUTED
+            | apscheduler_events.EVENT_JOB_ERROR
+            | apscheduler_events.EVENT_JOB_MISSED,
+        )
+
+        # 任务执行指标：耗时、延迟、失败次数和并发数
+        self.metrics = JobMetrics(engine)
+        self.scheduler.add_listener(self.metrics.on_event, JobMetrics.EVENT_MASK)
 
     def start(self):
         """启动调度器"""
         if not self.scheduler.running:
             self.scheduler.start()
+            self.metrics.start()
             logger.info("调度器已启动")
 
     def stop(self):
         """停止调度器"""
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
+            self.metrics.stop()
             logger.info("调度器已停止")
 
-    def add_cron_job(self, func, cron_rule, args=None, job_id=None, replace_existing=True):
+    def set_result_dispatcher(self, dispatcher):
+        """
+        设置结果回调的分发函数
+        :param dispatcher: dispatcher(fn) 安排执行 fn，通常为 EventBus.page_dispatcher(page)，
+                           结果回调不会在调度器或执行器线程中执行；为空时直接执行
+        """
+        self._result_dispatcher = dispatcher
+
+    def subscribe(self, callback, mask=None):
+        """
+        订阅调度器事件
+        :param callback: 事件回调，参数为 apscheduler 事件对象
+        :param mask: 事件掩码，默认订阅全部事件
+        """
+        if callback in self._listeners:
+            return
+        if mask is None:
+            mask = apscheduler_events.EVENT_ALL
+        self.scheduler.add_listener(callback, mask)
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """取消订阅调度器事件"""
+        if callback in self._listeners:
+            self.scheduler.remove_listener(callback)
+            self._listeners.remove(callback)
+
+    def add_cron_job(self, func, cron_rule, args=None, job_id=None, replace_existing=True,
+                     executor=EXECUTOR_THREAD, on_result=None):
         """
         添加 Cron 定时任务
         :param func: 任务函数
@@ -44,11 +174,14 @@ class SchedulerManager:
         :param args: 任务函数的参数列表
         :param job_id: 任务ID
         :param replace_existing: 是否替换已存在的任务
+        :param executor: 执行方式，thread / process / asyncio
+        :param on_result: 结果回调，签名为 on_result(job_id, retval, exception)
         """
-        trigger = CronTrigger.from_crontab(cron_rule)
-        self._add_job(func, trigger, args, job_id, replace_existing)
+        trigger = apscheduler_cron.CronTrigger.from_crontab(cron_rule)
+        self._add_job(func, trigger, args, job_id, replace_existing, executor, on_result)
 
-    def add_interval_job(self, func, seconds=0, minutes=0, hours=0, args=None, job_id=None, replace_existing=True):
+    def add_interval_job(self, func, seconds=0, minutes=0, hours=0, args=None, job_id=None,
+                         replace_existing=True, executor=EXECUTOR_THREAD, on_result=None):
         """
         添加间隔任务
         :param func: 任务函数
@@ -58,26 +191,91 @@ class SchedulerManager:
         :param args: 任务函数的参数列表
         :param job_id: 任务ID
         :param replace_existing: 是否替换已存在的任务
+        :param executor: 执行方式，thread / process / asyncio
+        :param on_result: 结果回调，签名为 on_result(job_id, retval, exception)
         """
-        trigger = IntervalTrigger(
+        trigger = apscheduler_interval.IntervalTrigger(
             seconds=seconds,
             minutes=minutes,
             hours=hours
         )
-        self._add_job(func, trigger, args, job_id, replace_existing)
+        self._add_job(func, trigger, args, job_id, replace_existing, executor, on_result)
+
+    def add_date_job(self, func, run_date, args=None, job_id=None, replace_existing=True,
+                     executor=EXECUTOR_THREAD, on_result=None):
+        """
+        添加指定时间执行一次的任务
+        :param func: 任务函数
+        :param run_date: 执行时间，datetime 或 "YYYY-MM-DD HH:MM:SS" 字符串
+        :param args: 任务函数的参数列表
+        :param job_id: 任务ID
+        :param replace_existing: 是否替换已存在的任务
+        :param executor: 执行方式，thread / process / asyncio
+        :param on_result: 结果回调，签名为 on_result(job_id, retval, exception)
+        """
+        trigger = apscheduler_date.DateTrigger(run_date=run_date)
+        self._add_job(func, trigger, args, job_id, replace_existing, executor, on_result)
 
-    def _add_job(self, func, trigger, args=None, job_id=None, replace_existing=True):
+    def _add_job(self, func, trigger, args=None, job_id=None, replace_existing=True,
+                 executor=EXECUTOR_THREAD, on_result=None):
         """
         内部添加任务的通用方法
         """
-        self.scheduler.add_job(
+        executor_alias = self._resolve_executor(executor, func, args)
+        job = self.scheduler.add_job(
             func=func,
             trigger=trigger,
             args=args or [],
             id=job_id,
-            replace_existing=replace_existing
+            replace_existing=replace_existing,
+            executor=executor_alias,
         )
-        logger.info(f"任务已添加: {job_id} (trigger: {trigger})")
+        if on_result is not None:
+            self._result_callbacks[job.id] = on_result
+        logger.info(f"任务已添加: {job_id} (trigger: {trigger}, executor: {executor})")
+
+    def _resolve_executor(self, executor, func, args):
+        """
+        校验执行方式并返回执行器别名
+        进程池任务必须能通过 "模块:函数" 引用，且参数可被 pickle；
+        func 也可以是导入任务时的 "模块:函数" 字符串
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"不支持的执行方式: {executor}")
+        if executor == self.EXECUTOR_PROCESS:
+            try:
+                if isinstance(func, str):
+                    apscheduler_util.ref_to_obj(func)
+                else:
+                    apscheduler_util.obj_to_ref(func)
+                pickle.dumps(list(args or []))
+            except Exception as e:
+                raise ValueError(f"进程池任务的函数和参数必须可序列化: {e}") from e
+        return self.EXECUTORS[executor]
+
+    def _dispatch_result(self, event):
+        """
+        将任务执行结果或异常回传给注册的结果回调
+        任务已不存在（如执行完毕的一次性任务）时同时移除结果回调
+        """
+        callback = self._result_callbacks.get(event.job_id)
+        if callback is None:
+            return
+        if self.scheduler.get_job(event.job_id) is None:
+            self._result_callbacks.pop(event.job_id, None)
+        if event.code == apscheduler_events.EVENT_JOB_MISSED:
+            return
+
+        def run():
+            try:
+                callback(event.job_id, event.retval, event.exception)
+            except Exception as e:
+                logger.error(f"任务结果回调失败: {event.job_id}, 错误: {e}")
+
+        if self._result_dispatcher is None:
+            run()
+        else:
+            self._result_dispatcher(run)
 
     def remove_job(self, job_id):
         """
@@ -86,6 +284,8 @@ class SchedulerManager:
         """
         try:
             self.scheduler.remove_job(job_id)
+            self._result_callbacks.pop(job_id, None)
+            self.metrics.forget(job_id)
             logger.info(f"任务已删除: {job_id}")
         except Exception as e:
             logger.error(f"删除任务失败: {job_id}, 错误: {e}")
@@ -94,36 +294,149 @@ class SchedulerManager:
         """获取所有任务"""
         return self.scheduler.get_jobs()
 
-    def load_jobs_from_db(self, db_session: Session):
+    # ---- 批量操作 ----
+    @contextmanager
+    def batch(self):
+        """
+        批量操作上下文
+        持久化存储在结束时一次写入，并屏蔽当前线程中 apscheduler 逐个任务的日志，
+        其他线程的调度器日志不受影响
+        """
+        log_filter = _ThreadLogFilter(threading.get_ident(), logging.WARNING)
+        with ExitStack() as stack:
+            if self.job_store is not None:
+                stack.enter_context(self.job_store.batch())
+            _scheduler_logger.addFilter(log_filter)
+            try:
+                yield self
+            finally:
+                _scheduler_logger.removeFilter(log_filter)
+
+    def add_jobs(self, specs, replace_existing=True):
+        """
+        批量添加任务
+        :param specs: 任务定义列表，格式见 app/tasks/job_io.py 的 JOB_FIELDS；
+                      func 为空时使用 execute_task
+        :return: (成功数量, 失败列表[(任务ID, 错误信息)])
+        """
+        from app.tasks.job_io import build_trigger
+
+        added, failed = 0, []
+        default_func = apscheduler_util.obj_to_ref(SchedulerManager.execute_task)
+        with self.batch():
+            for spec in specs:
+                try:
+                    func = spec.get("func") or default_func
+                    executor = spec.get("executor") or self.EXECUTOR_THREAD
+                    job_kwargs = {}
+                    if spec.get("paused"):
+                        job_kwargs["next_run_time"] = None
+                    self.scheduler.add_job(
+                        func=func,
+                        trigger=build_trigger(spec),
+                        args=spec.get("args") or [],
+                        id=spec.get("id"),
+                        name=spec.get("name"),
+                        replace_existing=replace_existing,
+                        executor=self._resolve_executor(executor, func, spec.get("args")),
+                        **job_kwargs,
+                    )
+                    added += 1
+                except Exception as e:
+                    failed.append((spec.get("id"), str(e)))
+        logger.info(f"批量添加任务: 成功 {added} 个, 失败 {len(failed)} 个")
+        return added, failed
+
+    def pause_jobs(self, job_ids):
+        """批量暂停任务，返回 (成功数量, 失败列表)"""
+        return self._apply_batch("暂停", self.scheduler.pause_job, job_ids)
+
+    def resume_jobs(self, job_ids):
+        """批量恢复任务，返回 (成功数量, 失败列表)"""
+        return self._apply_batch("恢复", self.scheduler.resume_job, job_ids)
+
+    def remove_jobs(self, job_ids):
+        """批量删除任务，返回 (成功数量, 失败列表)"""
+        def remove(job_id):
+            self.scheduler.remove_job(job_id)
+            self._result_callbacks.pop(job_id, None)
+            self.metrics.forget(job_id)
+
+        return self._apply_batch("删除", remove, job_ids)
+
+    def _apply_batch(self, action, operation, job_ids):
+        """在一个批次中对多个任务执行同一操作"""
+        done, failed = 0, []
+        with self.batch():
+            for job_id in job_ids:
+                try:
+                    operation(job_id)
+                    done += 1
+                except Exception as e:
+                    failed.append((job_id, str(e)))
+        logger.info(f"批量{action}任务: 成功 {done} 个, 失败 {len(failed)} 个")
+        return done, failed
+
+    def export_jobs(self, path, fmt=None):
+        """
+        导出任务定义
+        :param path: 文件路径
+        :param fmt: json / csv，为空时按扩展名判断
+        :return: 导出的任务数量
+        """
+        from app.tasks.job_io import job_to_spec, write_specs
+
+        executor_modes = {alias: mode for mode, alias in self.EXECUTORS.items()}
+        specs = [job_to_spec(job, executor_modes) for job in self.get_jobs()]
+        write_specs(path, specs, fmt)
+        logger.info(f"已导出 {len(specs)} 个任务: {path}")
+        return len(specs)
+
+    def import_jobs(self, path, fmt=None, replace_existing=True):
+        """
+        从文件导入任务定义
+        :return: (成功数量, 失败列表)，见 add_jobs
+        """
+        from app.tasks.job_io import read_specs
+
+        return self.add_jobs(read_specs(path, fmt), replace_existing=replace_existing)
+
+    def get_job_stats(self, job_id):
+        """获取任务的执行指标，见 JobMetrics.get_job_stats"""
+        return self.metrics.get_job_stats(job_id)
+
+    def load_jobs_from_db(self, db_session: "Session", skip_existing=True):
         """
         从数据库加载定时任务
         这里使用 ExampleModel 作为示例，实际使用时替换为你的模型
+        :param db_session: 数据库会话，只做查询，可使用 get_session(read_only=True)
+        :param skip_existing: 跳过已从持久化存储恢复的任务
         """
+        from app.repository.example_model_repository import ExampleModelRepository
+
         try:
-            # 查询所有需要定时执行的任务
-            tasks = db_session.query(ExampleModel).filter(
-                ExampleModel.settings.contains({"scheduled": True})
-            ).all()
+            # 查询所有需要定时执行的任务，调度字段来自 settings 的生成列，走索引查询
+            tasks = ExampleModelRepository(db_session).get_scheduled()
+
+            existing_ids = {job.id for job in self.get_jobs()} if skip_existing else set()
 
             for task in tasks:
-                # 从 settings 中获取调度配置
-                schedule_config = task.settings.get("schedule", {})
-                
-                if schedule_config.get("type") == "cron":
+                if f"task_{task['id']}" in existing_ids:
+                    continue
+
+                if task["schedule_type"] == "cron":
                     self.add_cron_job(
                         func=self.execute_task,
-                        cron_rule=schedule_config.get("cron"),
-                        args=[task.id, task.name],
-                        job_id=f"task_{task.id}"
+                        cron_rule=task["schedule_cron"],
+                        args=[task["id"], task["name"]],
+                        job_id=f"task_{task['id']}"
                     )
-                elif schedule_config.get("type") == "interval":
+                elif task["schedule_type"] == "interval":
                     self.add_interval_job(
                         func=self.execute_task,
-                        seconds=schedule_config.get("seconds", 0),
-                        minutes=schedule_config.get("minutes", 0),
-                        hours=schedule_config.get("hours", 0),
-                        args=[task.id, task.name],
-                        job_id=f"task_{task.id}"
+                        seconds=task["schedule_interval"] or 0,
+                        args=[task["id"], task["name"]],
+                        job_id=f"task_{task['id']}"
                     )
 
             logger.info("已从数据库加载所有定时任务")
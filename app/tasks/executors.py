@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import sys
+import threading
+
+from apscheduler.executors.base import BaseExecutor, run_coroutine_job, run_job
+from apscheduler.util import iscoroutinefunction_partial
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncioLoopExecutor(BaseExecutor):
+    """
+    事件循环执行器
+    在独立的事件循环线程中运行任务：协程函数直接在循环中调度，
+    普通函数在循环的默认线程池中运行，不占用 Flet 的 UI 事件循环
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._loop = None
+        self._thread = None
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"SchedulerLoop-{alias}", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self, wait=True):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._loop = None
+        self._thread = None
+
+    def _do_submit_job(self, job, run_times):
+        def callback(f):
+            try:
+                events = f.result()
+            except BaseException:
+                self._run_job_error(job.id, *sys.exc_info()[1:])
+            else:
+                self._run_job_success(job.id, events)
+
+        if iscoroutinefunction_partial(job.func):
+            coro = run_coroutine_job(job, job._jobstore_alias, run_times, self._logger.name)
+        else:
+            coro = self._run_in_executor(job, run_times)
+        f = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        f.add_done_callback(callback)
+
+    async def _run_in_executor(self, job, run_times):
+        """在事件循环的默认线程池中运行普通函数"""
+        return await self._loop.run_in_executor(
+            None, run_job, job, job._jobstore_alias, run_times, self._logger.name
+        )
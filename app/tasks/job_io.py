@@ -0,0 +1,138 @@
+import csv
+import json
+import os
+
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+# 任务定义的字段，同时也是 CSV 的列
+JOB_FIELDS = [
+    "id", "name", "func", "args", "trigger", "cron", "seconds", "run_date",
+    "start_date", "end_date", "timezone", "executor", "paused",
+]
+
+# crontab 五段式表达式对应的 CronTrigger 字段
+_CRONTAB_FIELDS = ["minute", "hour", "day", "month", "day_of_week"]
+# 完整的八段式表达式：秒 分 时 日 月 周几 周数 年，秒、周数或年不是默认值时使用
+_CRON_FIELDS = ["second"] + _CRONTAB_FIELDS + ["week", "year"]
+_CRON_DEFAULTS = {"second": "0", "week": "*", "year": "*"}
+
+
+def build_trigger(spec):
+    """
+    根据任务定义创建触发器
+    :param spec: 任务定义，trigger 为 cron / interval / date
+    """
+    trigger_type = spec.get("trigger")
+    # 起止时间为 ISO 格式字符串，时区为时区名称，为空时使用默认值
+    window = {
+        "start_date": spec.get("start_date"),
+        "end_date": spec.get("end_date"),
+        "timezone": spec.get("timezone"),
+    }
+    if trigger_type == "cron":
+        values = spec["cron"].split()
+        if len(values) == len(_CRONTAB_FIELDS):
+            fields = dict(zip(_CRONTAB_FIELDS, values))
+        elif len(values) == len(_CRON_FIELDS):
+            fields = dict(zip(_CRON_FIELDS, values))
+        else:
+            raise ValueError(f"cron 表达式应为 5 段或 8 段: {spec['cron']}")
+        return CronTrigger(**fields, **window)
+    if trigger_type == "interval":
+        return IntervalTrigger(seconds=float(spec["seconds"]), **window)
+    if trigger_type == "date":
+        return DateTrigger(run_date=spec["run_date"])
+    raise ValueError(f"不支持的触发器类型: {trigger_type}")
+
+
+def job_to_spec(job, executor_modes):
+    """
+    将任务转换为任务定义
+    :param job: apscheduler 任务
+    :param executor_modes: 执行器别名 -> 执行方式
+    """
+    spec = {
+        "id": job.id,
+        "name": job.name,
+        "func": job.func_ref,
+        "args": list(job.args),
+        "trigger": None,
+        "cron": None,
+        "seconds": None,
+        "run_date": None,
+        "start_date": None,
+        "end_date": None,
+        "timezone": None,
+        "executor": executor_modes.get(job.executor, job.executor),
+        # 调度器启动前添加的任务还没有 next_run_time 属性，视为未暂停
+        "paused": getattr(job, "next_run_time", False) is None,
+    }
+    trigger = job.trigger
+    if isinstance(trigger, CronTrigger):
+        fields = {field.name: str(field) for field in trigger.fields}
+        spec["trigger"] = "cron"
+        full = any(fields[name] != default for name, default in _CRON_DEFAULTS.items())
+        spec["cron"] = " ".join(fields[name] for name in (_CRON_FIELDS if full else _CRONTAB_FIELDS))
+        _export_window(spec, trigger)
+    elif isinstance(trigger, IntervalTrigger):
+        spec["trigger"] = "interval"
+        spec["seconds"] = trigger.interval.total_seconds()
+        _export_window(spec, trigger)
+    elif isinstance(trigger, DateTrigger):
+        spec["trigger"] = "date"
+        spec["run_date"] = trigger.run_date.isoformat()
+    else:
+        raise ValueError(f"无法导出的触发器: {trigger}")
+    return spec
+
+
+def _export_window(spec, trigger):
+    """导出 cron / interval 触发器的起止时间和时区"""
+    if trigger.start_date is not None:
+        spec["start_date"] = trigger.start_date.isoformat()
+    if trigger.end_date is not None:
+        spec["end_date"] = trigger.end_date.isoformat()
+    spec["timezone"] = str(trigger.timezone)
+
+
+def _detect_format(path, fmt):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in ("json", "csv"):
+        raise ValueError(f"不支持的文件格式: {fmt}")
+    return fmt
+
+
+def write_specs(path, specs, fmt=None):
+    """
+    将任务定义写入 JSON 或 CSV 文件
+    :param fmt: json / csv，为空时按扩展名判断
+    """
+    fmt = _detect_format(path, fmt)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "json":
+            json.dump(specs, f, ensure_ascii=False, indent=4)
+            return
+        writer = csv.DictWriter(f, fieldnames=JOB_FIELDS)
+        writer.writeheader()
+        for spec in specs:
+            row = {key: spec.get(key) for key in JOB_FIELDS}
+            row["args"] = json.dumps(row["args"] or [], ensure_ascii=False)
+            row["paused"] = int(bool(row["paused"]))
+            writer.writerow(row)
+
+
+def read_specs(path, fmt=None):
+    """从 JSON 或 CSV 文件读取任务定义"""
+    fmt = _detect_format(path, fmt)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "json":
+            return json.load(f)
+        specs = []
+        for row in csv.DictReader(f):
+            spec = {key: (value if value != "" else None) for key, value in row.items()}
+            spec["args"] = json.loads(spec["args"]) if spec.get("args") else []
+            spec["paused"] = spec.get("paused") in ("1", "true", "True")
+            specs.append(spec)
+        return specs
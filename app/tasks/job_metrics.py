@@ -0,0 +1,243 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
+from sqlalchemy import insert
+
+from app.db.models import JobRunHistory
+
+logger = logging.getLogger(__name__)
+
+STATUS_SUCCESS = "success"
+STATUS_ERROR = "error"
+STATUS_MISSED = "missed"
+
+
+class JobMetrics:
+    """
+    任务执行指标
+    监听调度器事件，记录每个任务的耗时、延迟、失败次数和并发数，
+    最近的执行记录保存在固定大小的环形缓冲区中，并分批写入数据库
+    """
+
+    EVENT_MASK = (
+        EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR
+        | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+    )
+
+    def __init__(self, engine=None, capacity=1000, batch_size=100, flush_interval=5.0):
+        """
+        :param engine: SQLAlchemy 引擎，为空时只保留内存记录
+        :param capacity: 环形缓冲区大小
+        :param batch_size: 待写入记录达到该数量时立即写入
+        :param flush_interval: 定时写入间隔（秒）
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._runs = deque(maxlen=capacity)       # 最近的执行记录
+        self._unflushed = deque(maxlen=capacity)  # 尚未写入数据库的记录
+        self._stats = {}                          # job_id -> 聚合指标
+        self._inflight = {}                       # (job_id, 计划时间) -> (提交时刻, 延迟, 并发数)
+        self._peak_concurrency = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._writer = None
+
+    # ---- 生命周期 ----
+    def start(self):
+        """启动后台写入线程"""
+        if self.engine is None or self._writer is not None:
+            return
+        self._stopped.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="JobMetricsWriter", daemon=True)
+        self._writer.start()
+
+    def stop(self):
+        """停止后台写入线程并写入剩余记录"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+            self._writer = None
+        self.flush()
+
+    # ---- 事件处理 ----
+    def on_event(self, event):
+        """调度器事件回调"""
+        if event.code == EVENT_JOB_SUBMITTED:
+            self._on_submitted(event)
+        elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            self._on_finished(event)
+        elif event.code in (EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES):
+            self._on_missed(event)
+
+    def _on_submitted(self, event):
+        now = time.time()
+        submitted = time.perf_counter()
+        with self._lock:
+            for run_time in event.scheduled_run_times:
+                lateness_ms = max((now - run_time.timestamp()) * 1000, 0.0)
+                self._inflight[(event.job_id, run_time)] = (submitted, lateness_ms, len(self._inflight) + 1)
+            self._peak_concurrency = max(self._peak_concurrency, len(self._inflight))
+
+    def _on_finished(self, event):
+        finished = time.perf_counter()
+        with self._lock:
+            submitted, lateness_ms, concurrency = self._inflight.pop(
+                (event.job_id, event.scheduled_run_time), (None, None, None)
+            )
+        duration_ms = (finished - submitted) * 1000 if submitted is not None else None
+        status = STATUS_ERROR if event.exception is not None else STATUS_SUCCESS
+        self._record(event.job_id, status, event.scheduled_run_time, duration_ms,
+                     lateness_ms, concurrency, event.exception)
+
+    def _on_missed(self, event):
+        # 错过的执行在提交后由执行器判定，需要移出执行中列表；达到最大实例数的事件包含多个计划时间
+        run_times = getattr(event, "scheduled_run_times", None) or [event.scheduled_run_time]
+        now = time.time()
+        with self._lock:
+            for run_time in run_times:
+                self._inflight.pop((event.job_id, run_time), None)
+            concurrency = len(self._inflight)
+        for run_time in run_times:
+            lateness_ms = max((now - run_time.timestamp()) * 1000, 0.0)
+            self._record(event.job_id, STATUS_MISSED, run_time, None,
+                         lateness_ms, concurrency, None)
+
+    def _record(self, job_id, status, scheduled_run_time, duration_ms, lateness_ms, concurrency, exception):
+        """记录一次执行并更新聚合指标"""
+        record = {
+            "job_id": job_id,
+            "status": status,
+            "scheduled_at": scheduled_run_time.timestamp() if scheduled_run_time else None,
+            "finished_at": time.time(),
+            "duration_ms": duration_ms,
+            "lateness_ms": lateness_ms,
+            "concurrency": concurrency,
+            "error": repr(exception) if exception is not None else None,
+        }
+        with self._lock:
+            self._runs.append(record)
+            self._unflushed.append(record)
+            stats = self._stats.setdefault(job_id, {
+                "job_id": job_id,
+                "runs": 0,
+                "failures": 0,
+                "misfires": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "last_ms": None,
+                "max_lateness_ms": 0.0,
+                "last_status": None,
+                "last_finished_at": None,
+            })
+            if status == STATUS_MISSED:
+                stats["misfires"] += 1
+            else:
+                stats["runs"] += 1
+                if status == STATUS_ERROR:
+                    stats["failures"] += 1
+                if duration_ms is not None:
+                    stats["total_ms"] += duration_ms
+                    stats["max_ms"] = max(stats["max_ms"], duration_ms)
+                    stats["last_ms"] = duration_ms
+            if lateness_ms is not None:
+                stats["max_lateness_ms"] = max(stats["max_lateness_ms"], lateness_ms)
+            stats["last_status"] = status
+            stats["last_finished_at"] = record["finished_at"]
+            should_flush = len(self._unflushed) >= self.batch_size
+        if should_flush:
+            self._wakeup.set()
+
+    # ---- 查询接口 ----
+    def get_job_stats(self, job_id):
+        """
+        获取单个任务的聚合指标
+        :return: 指标字典，avg_ms 为平均耗时；任务尚未执行时返回 None
+        """
+        with self._lock:
+            stats = self._stats.get(job_id)
+            return self._with_average(stats) if stats else None
+
+    def get_all_stats(self):
+        """获取所有任务的聚合指标"""
+        with self._lock:
+            return [self._with_average(stats) for stats in self._stats.values()]
+
+    def slowest_jobs(self, limit=10):
+        """按平均耗时降序返回最慢的任务"""
+        stats = [s for s in self.get_all_stats() if s["avg_ms"] is not None]
+        return sorted(stats, key=lambda s: s["avg_ms"], reverse=True)[:limit]
+
+    def recent_runs(self, job_id=None, limit=50):
+        """获取最近的执行记录，按完成时间倒序"""
+        with self._lock:
+            runs = list(self._runs)
+        if job_id is not None:
+            runs = [r for r in runs if r["job_id"] == job_id]
+        return runs[::-1][:limit]
+
+    def queue_depth(self):
+        """已提交但尚未完成的执行数"""
+        with self._lock:
+            return len(self._inflight)
+
+    def peak_concurrency(self):
+        """启动以来的最大并发执行数"""
+        with self._lock:
+            return self._peak_concurrency
+
+    def forget(self, job_id):
+        """清除已删除任务的聚合指标"""
+        with self._lock:
+            self._stats.pop(job_id, None)
+
+    @staticmethod
+    def _with_average(stats):
+        completed = stats["runs"]
+        result = dict(stats)
+        result["avg_ms"] = stats["total_ms"] / completed if completed else None
+        return result
+
+    # ---- 持久化 ----
+    def flush(self):
+        """将未写入的执行记录批量写入数据库，失败时保留到下次写入"""
+        if self.engine is None:
+            return
+        with self._lock:
+            batch = list(self._unflushed)
+            self._unflushed.clear()
+        if not batch:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(JobRunHistory), batch)
+            logger.debug(f"已写入 {len(batch)} 条任务执行记录")
+        except Exception as e:
+            logger.error(f"写入任务执行记录失败: {e}")
+            # 写入失败时放回队列头部，超出缓冲区大小时丢弃最早的记录
+            with self._lock:
+                newer = list(self._unflushed)
+                self._unflushed.clear()
+                self._unflushed.extend(batch)
+                self._unflushed.extend(newer)
+                dropped = len(batch) + len(newer) - len(self._unflushed)
+            if dropped:
+                logger.warning(f"待写入的任务执行记录过多，已丢弃 {dropped} 条")
+
+    def _write_loop(self):
+        """后台写入线程，按时间间隔或批量大小触发写入"""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
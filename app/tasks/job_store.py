@@ -0,0 +1,197 @@
+import logging
+import pickle
+import threading
+from contextlib import contextmanager
+
+from apscheduler.job import Job
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.util import datetime_to_utc_timestamp
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from app.db.models import SchedulerJob
+
+logger = logging.getLogger(__name__)
+
+# SQLite 单条语句的参数数量有限，批量删除时分块执行
+_DELETE_CHUNK_SIZE = 500
+
+
+class PersistentJobStore(MemoryJobStore):
+    """
+    持久化任务存储
+    调度器从内存中读取任务，任务状态变更由后台线程合并后批量写入数据库（write-behind），
+    启动时通过一次按 next_run_time 索引排序的查询恢复全部任务
+    """
+
+    def __init__(self, engine, flush_interval=1.0, pickle_protocol=pickle.HIGHEST_PROTOCOL, read_engine=None):
+        """
+        :param engine: SQLAlchemy 引擎，通常为 DatabaseManager.engine
+        :param read_engine: 恢复任务使用的只读引擎，为空时使用 engine
+        :param flush_interval: 合并写入的间隔（秒）
+        :param pickle_protocol: 任务状态序列化使用的 pickle 协议
+        """
+        super().__init__()
+        self.engine = engine
+        self.read_engine = read_engine or engine
+        self.flush_interval = flush_interval
+        self.pickle_protocol = pickle_protocol
+        self._table = SchedulerJob.__table__
+        self._pending = {}          # job_id -> (next_run_time, job_state)，None 表示删除
+        self._clear_all = False     # 下次写入前是否清空整张表
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._writer = None
+        self._batch_depth = 0       # 批量操作期间暂停后台写入
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self._rehydrate()
+        self._stopped.clear()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="JobStoreWriter", daemon=True
+        )
+        self._writer.start()
+
+    def shutdown(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+            self._writer = None
+        self.flush()
+        super().shutdown()
+
+    def add_job(self, job):
+        super().add_job(job)
+        self._enqueue_job(job)
+
+    def update_job(self, job):
+        super().update_job(job)
+        self._enqueue_job(job)
+
+    def remove_job(self, job_id):
+        super().remove_job(job_id)
+        with self._pending_lock:
+            self._pending[job_id] = None
+        self._wakeup.set()
+
+    def remove_all_jobs(self):
+        super().remove_all_jobs()
+        with self._pending_lock:
+            self._pending.clear()
+            self._clear_all = True
+        self._wakeup.set()
+
+    @contextmanager
+    def batch(self):
+        """
+        批量操作
+        期间的所有变更在退出时一次写入数据库
+        """
+        with self._pending_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._pending_lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush()
+
+    def flush(self):
+        """立即将所有待写入的任务状态写入数据库"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            clear_all, self._clear_all = self._clear_all, False
+        if not pending and not clear_all:
+            return
+
+        upserts = [
+            {"id": job_id, "next_run_time": item[0], "job_state": item[1]}
+            for job_id, item in pending.items() if item is not None
+        ]
+        deletes = [job_id for job_id, item in pending.items() if item is None]
+
+        try:
+            with self.engine.begin() as conn:
+                if clear_all:
+                    conn.execute(delete(self._table))
+                for i in range(0, len(deletes), _DELETE_CHUNK_SIZE):
+                    chunk = deletes[i:i + _DELETE_CHUNK_SIZE]
+                    conn.execute(delete(self._table).where(self._table.c.id.in_(chunk)))
+                if upserts:
+                    stmt = insert(self._table)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[self._table.c.id],
+                        set_={
+                            "next_run_time": stmt.excluded.next_run_time,
+                            "job_state": stmt.excluded.job_state,
+                        },
+                    )
+                    conn.execute(stmt, upserts)
+            logger.debug(f"任务状态已写入: 更新 {len(upserts)} 条, 删除 {len(deletes)} 条")
+        except Exception as e:
+            logger.error(f"写入任务状态失败: {e}")
+            # 写入失败时放回队列，保留期间产生的更新
+            with self._pending_lock:
+                for job_id, item in pending.items():
+                    self._pending.setdefault(job_id, item)
+                self._clear_all = self._clear_all or clear_all
+
+    def _rehydrate(self):
+        """从数据库批量恢复任务"""
+        query = select(self._table.c.id, self._table.c.job_state).order_by(
+            self._table.c.next_run_time
+        )
+        with self.read_engine.connect() as conn:
+            rows = conn.execute(query).all()
+
+        restored, broken = 0, []
+        for job_id, job_state in rows:
+            try:
+                job = self._reconstitute_job(job_state)
+            except Exception as e:
+                logger.error(f"恢复任务失败，已移除: {job_id}, 错误: {e}")
+                broken.append(job_id)
+                continue
+            MemoryJobStore.add_job(self, job)
+            restored += 1
+
+        if broken:
+            with self._pending_lock:
+                for job_id in broken:
+                    self._pending[job_id] = None
+        logger.info(f"已从数据库恢复 {restored} 个任务")
+
+    def _reconstitute_job(self, job_state):
+        """将序列化的任务状态还原为任务对象"""
+        state = pickle.loads(job_state)
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _enqueue_job(self, job):
+        """记录待写入的任务状态"""
+        try:
+            job_state = pickle.dumps(job.__getstate__(), self.pickle_protocol)
+        except Exception as e:
+            logger.warning(f"任务无法序列化，仅保存在内存中: {job.id}, 错误: {e}")
+            return
+        with self._pending_lock:
+            self._pending[job.id] = (datetime_to_utc_timestamp(job.next_run_time), job_state)
+        self._wakeup.set()
+
+    def _write_loop(self):
+        """后台写入线程，合并 flush_interval 内的所有变更后一次写入"""
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped.wait(self.flush_interval):
+                break
+            if self._batch_depth == 0:
+                self.flush()
@@ -0,0 +1,136 @@
+"""
+SQLite 连接参数基准测试
+对比 SQLite 默认参数与 app.db.sqlite_profile 中的参数在本应用典型负载下的表现
+使用示例:
+    python -m app.utils.db_benchmark
+    python -m app.utils.db_benchmark --writes 2000 --readers 4
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.pool import QueuePool
+
+from app.db.models import Base, DEFAULT_CONFIGS, JobRunHistory, SystemConfig
+from app.db.sqlite_profile import DEFAULT_PROFILE, apply_profile
+
+# SQLite 默认参数（回滚日志、FULL 同步）
+BASELINE_PROFILE = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "mmap_size": None,
+    "cache_size": None,
+    "temp_store": None,
+    "busy_timeout": 5000,
+}
+
+
+def _create_engine(path, profile):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=8,
+    )
+    apply_profile(engine, profile)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(SystemConfig), DEFAULT_CONFIGS)
+    return engine
+
+
+def _small_writes(engine, count):
+    """逐条提交的小事务，对应设置保存和任务状态更新"""
+    table = SystemConfig.__table__
+    started = time.perf_counter()
+    for i in range(count):
+        with engine.begin() as conn:
+            conn.execute(
+                update(table).where(table.c.config_key == "window_width").values(config_value=str(i))
+            )
+    return (time.perf_counter() - started) * 1000
+
+
+def _batch_inserts(engine, batches, batch_size):
+    """批量插入，对应任务执行记录的写入"""
+    row = {"job_id": "bench", "status": "success", "scheduled_at": 0.0, "finished_at": 0.0, "duration_ms": 1.0}
+    started = time.perf_counter()
+    for _ in range(batches):
+        with engine.begin() as conn:
+            conn.execute(insert(JobRunHistory), [row] * batch_size)
+    return (time.perf_counter() - started) * 1000
+
+
+def _reads_during_writes(engine, writes, readers):
+    """后台持续写入时界面线程的读取延迟"""
+    table = SystemConfig.__table__
+    stop = threading.Event()
+    latencies = []
+    lock = threading.Lock()
+
+    def read_loop():
+        while not stop.is_set():
+            started = time.perf_counter()
+            with engine.connect() as conn:
+                conn.execute(select(table)).all()
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=read_loop, daemon=True) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    _small_writes(engine, writes)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+    }
+
+
+def run_profile(name, profile, writes, readers):
+    """在临时数据库上运行全部负载"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = _create_engine(os.path.join(directory, "bench.db"), profile)
+        try:
+            result = {"profile": name}
+            result["small_writes_ms"] = _small_writes(engine, writes)
+            result["batch_inserts_ms"] = _batch_inserts(engine, writes // 10, 100)
+            result.update(_reads_during_writes(engine, writes, readers))
+            return result
+        finally:
+            engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite 连接参数基准测试")
+    parser.add_argument("--writes", type=int, default=1000, help="小事务写入次数")
+    parser.add_argument("--readers", type=int, default=4, help="并发读取线程数")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_profile("default", BASELINE_PROFILE, args.writes, args.readers),
+        run_profile("tuned", DEFAULT_PROFILE, args.writes, args.readers),
+    ]
+
+    header = f"{'profile':<10}{'小事务(ms)':>14}{'批量插入(ms)':>16}{'并发读取次数':>14}{'读 p50(ms)':>12}{'读 p99(ms)':>12}"
+    print(header)
+    for r in results:
+        print(
+            f"{r['profile']:<10}{r['small_writes_ms']:>14.1f}{r['batch_inserts_ms']:>16.1f}"
+            f"{r['reads']:>14}{r['p50_ms']:>12.2f}{r['p99_ms']:>12.2f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import threading
+import time
+
+
+class Debouncer:
+    """
+    防抖器
+    delay 秒内的多次触发合并为一次执行；持续触发时最迟 max_wait 秒执行一次，
+    执行时使用最后一次触发的参数
+    """
+
+    def __init__(self, func, delay, max_wait=None):
+        """
+        :param func: 要执行的函数
+        :param delay: 最后一次触发后等待的秒数
+        :param max_wait: 从第一次触发起最长等待的秒数，为空时不限制
+        """
+        self.func = func
+        self.delay = delay
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._timer = None
+        self._generation = 0  # 每次重新计时加一，过期的定时器不会执行
+        self._first_trigger = None
+        self._args = ()
+        self._kwargs = {}
+
+    def trigger(self, *args, **kwargs):
+        """触发一次，重新开始计时"""
+        with self._lock:
+            now = time.monotonic()
+            if self._first_trigger is None:
+                self._first_trigger = now
+            self._args, self._kwargs = args, kwargs
+
+            wait = self.delay
+            if self.max_wait is not None:
+                wait = min(wait, max(self._first_trigger + self.max_wait - now, 0))
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._generation += 1
+            self._timer = threading.Timer(wait, self._run, args=(self._generation,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """如有待执行的调用，立即执行"""
+        with self._lock:
+            if self._timer is None:
+                return
+            self._timer.cancel()
+            generation = self._generation
+        self._run(generation)
+
+    def cancel(self):
+        """取消待执行的调用"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._reset()
+
+    @property
+    def pending(self):
+        """是否有待执行的调用"""
+        return self._timer is not None
+
+    def _run(self, generation):
+        with self._lock:
+            if self._timer is None or generation != self._generation:
+                return
+            args, kwargs = self._args, self._kwargs
+            self._reset()
+        self.func(*args, **kwargs)
+
+    def _reset(self):
+        self._timer = None
+        self._first_trigger = None
+        self._args, self._kwargs = (), {}
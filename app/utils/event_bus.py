@@ -0,0 +1,201 @@
+import inspect
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    """
+    事件总线
+    发布者只把事件放入对应主题的队列后立即返回，订阅者由分发函数安排执行：
+    - 每个主题一个队列，各主题分别调度，互不排队；同一主题的订阅者按发布顺序依次执行
+    - coalesce 中的主题只保留最新的事件（如 theme_changed 只需要最后一次）
+    - 记录每个订阅者的调用次数和耗时，超过 slow_handler_ms 时输出警告
+    - 绑定方法以弱引用订阅，对象（如被淘汰的视图）释放后自动取消订阅；
+      普通函数和 lambda 保持强引用，需要显式 unsubscribe
+    使用示例:
+        bus = EventBus(coalesce=["theme_changed"])
+        bus.set_dispatcher(EventBus.page_dispatcher(page))
+        bus.subscribe("theme_changed", on_theme_changed)
+        bus.publish("theme_changed", "dark")
+    """
+
+    def __init__(self, topics=None, coalesce=(), slow_handler_ms=50.0):
+        """
+        :param topics: 允许的主题，为空时不限制；订阅或发布未知主题会被忽略
+        :param coalesce: 只保留最新事件的主题
+        :param slow_handler_ms: 订阅者耗时超过该值时输出警告
+        """
+        self.topics = set(topics) if topics is not None else None
+        self.coalesce = set(coalesce)
+        self.slow_handler_ms = slow_handler_ms
+        self._handlers = defaultdict(list)  # 主题 -> 订阅者引用列表，调用引用得到订阅者
+        self._queues = defaultdict(deque)   # 主题 -> 待分发的 (args, kwargs)
+        self._scheduled = set()             # 已安排分发的主题
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._stats = {}                    # (主题, 订阅者名称) -> 耗时统计
+        self._dead_topics = deque()         # 有订阅者已被回收的主题，下次访问时清理
+        self._collected = 0                 # 已自动清理的订阅数
+
+    # ---- 分发方式 ----
+    def set_dispatcher(self, dispatcher):
+        """
+        设置分发函数
+        :param dispatcher: dispatcher(fn) 安排执行 fn，为空时在发布线程中同步执行
+        """
+        self._dispatcher = dispatcher
+
+    @staticmethod
+    def page_dispatcher(page):
+        """
+        Flet 页面的分发函数，订阅者在页面的线程池中执行
+        订阅者可能构建视图或读取数据库，不能放在事件循环中执行，否则会阻塞与客户端的通信
+        """
+        return lambda fn: page.run_thread(fn)
+
+    # ---- 订阅 ----
+    def subscribe(self, topic, callback):
+        """
+        订阅主题
+        绑定方法只保存弱引用，订阅不会延长对象的生命周期
+        """
+        if not self._known(topic):
+            return
+        with self._lock:
+            self._prune()
+            handlers = self._handlers[topic]
+            if any(ref() == callback for ref in handlers):
+                return
+            if inspect.ismethod(callback):
+                # 回调可能在任意线程的垃圾回收中触发，这里只做标记，不加锁
+                ref = weakref.WeakMethod(callback, lambda _ref, t=topic: self._dead_topics.append(t))
+            else:
+                ref = _StrongRef(callback)
+            handlers.append(ref)
+
+    def unsubscribe(self, topic, callback):
+        """取消订阅"""
+        with self._lock:
+            handlers = self._handlers.get(topic)
+            if handlers:
+                handlers[:] = [ref for ref in handlers if ref() is not None and ref() != callback]
+
+    def _prune(self):
+        """移除已被回收的订阅者，调用方需持有锁"""
+        while self._dead_topics:
+            topic = self._dead_topics.popleft()
+            handlers = self._handlers.get(topic)
+            if handlers:
+                alive = [ref for ref in handlers if ref() is not None]
+                self._collected += len(handlers) - len(alive)
+                handlers[:] = alive
+
+    # ---- 发布 ----
+    def publish(self, topic, *args, **kwargs):
+        """发布事件，不等待订阅者执行"""
+        if not self._known(topic):
+            return
+        with self._lock:
+            queue = self._queues[topic]
+            if topic in self.coalesce:
+                queue.clear()
+            queue.append((args, kwargs))
+            if topic in self._scheduled:
+                return
+            self._scheduled.add(topic)
+
+        if self._dispatcher is None:
+            self._drain(topic)
+        else:
+            self._dispatcher(lambda: self._drain(topic))
+
+    def _known(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def _drain(self, topic):
+        """
+        分发主题队列中的全部事件，直到队列为空
+        分发期间主题保持已调度状态，新事件由本次分发继续处理，同一主题不会在多个线程中并发执行
+        """
+        while True:
+            with self._lock:
+                self._prune()
+                queue = self._queues[topic]
+                if not queue:
+                    self._scheduled.discard(topic)
+                    return
+                events = list(queue)
+                queue.clear()
+                refs = list(self._handlers.get(topic, ()))
+            for args, kwargs in events:
+                for ref in refs:
+                    handler = ref()
+                    if handler is not None:
+                        self._invoke(topic, handler, args, kwargs)
+
+    def _invoke(self, topic, handler, args, kwargs):
+        name = getattr(handler, "__qualname__", repr(handler))
+        started = time.perf_counter()
+        try:
+            handler(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"事件处理失败: {topic} -> {name}, 错误: {e}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            stats = self._stats.setdefault((topic, name), {
+                "topic": topic, "handler": name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+            })
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if elapsed_ms > self.slow_handler_ms:
+            logger.warning(f"事件处理耗时过长: {topic} -> {name} {elapsed_ms:.1f}ms")
+
+    # ---- 统计 ----
+    def handler_stats(self):
+        """各订阅者的调用次数和耗时，按总耗时降序"""
+        with self._lock:
+            stats = [dict(s) for s in self._stats.values()]
+        for s in stats:
+            s["avg_ms"] = s["total_ms"] / s["calls"] if s["calls"] else 0.0
+        return sorted(stats, key=lambda s: s["total_ms"], reverse=True)
+
+    def subscriber_report(self):
+        """
+        各主题当前存活的订阅者，用于排查订阅泄漏
+        :return: {主题: [订阅者名称]}，另含 "_collected": 已自动清理的订阅数
+        """
+        with self._lock:
+            self._prune()
+            report = {
+                topic: [
+                    getattr(handler, "__qualname__", repr(handler))
+                    for handler in (ref() for ref in refs) if handler is not None
+                ]
+                for topic, refs in self._handlers.items()
+            }
+            report["_collected"] = self._collected
+        return report
+
+    def slow_handlers(self, threshold_ms=None):
+        """最大耗时超过阈值的订阅者"""
+        threshold_ms = self.slow_handler_ms if threshold_ms is None else threshold_ms
+        return [s for s in self.handler_stats() if s["max_ms"] > threshold_ms]
+
+
+class _StrongRef:
+    """与 weakref 调用方式一致的强引用，用于普通函数和 lambda"""
+
+    __slots__ = ("callback",)
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __call__(self):
+        return self.callback
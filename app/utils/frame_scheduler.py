@@ -0,0 +1,115 @@
+import logging
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+class FrameScheduler:
+    """
+    页面更新调度器
+    控件修改后只标记为待更新，每帧（约 16ms）统一调用一次 page.update(*controls)：
+    - 同一帧内多次标记同一控件只发送一次
+    - 祖先控件也被标记时跳过子控件，祖先的更新已包含子树
+    - 标记整个页面时只发送一次 page.update()
+    这样发送给客户端的数据量只与变化的子树有关，与页面大小无关
+    使用示例:
+        scheduler = FrameScheduler.for_page(page)
+        text.value = "..."
+        scheduler.mark_dirty(text)
+    """
+
+    _schedulers = weakref.WeakKeyDictionary()  # 页面 -> 调度器
+    _schedulers_lock = threading.Lock()
+
+    def __init__(self, page, interval=0.016):
+        """
+        :param page: Flet 页面
+        :param interval: 帧间隔（秒）
+        """
+        self.page = page
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._dirty = {}            # id(控件) -> 控件，保持标记顺序
+        self._page_dirty = False
+        self._scheduled = False
+        self._stats = {"frames": 0, "marked": 0, "sent": 0, "skipped": 0}
+
+    @classmethod
+    def for_page(cls, page):
+        """获取页面对应的调度器，每个页面一个"""
+        with cls._schedulers_lock:
+            scheduler = cls._schedulers.get(page)
+            if scheduler is None:
+                scheduler = cls._schedulers[page] = cls(page)
+            return scheduler
+
+    def mark_dirty(self, *controls):
+        """
+        标记待更新的控件，下一帧统一发送
+        :param controls: 控件，为空时更新整个页面
+        """
+        with self._lock:
+            if not controls:
+                self._page_dirty = True
+            for control in controls:
+                self._dirty[id(control)] = control
+            self._stats["marked"] += len(controls) or 1
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule()
+
+    def _schedule(self):
+        loop = self.page.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.call_later, self.interval, self.flush)
+        else:
+            timer = threading.Timer(self.interval, self.flush)
+            timer.daemon = True
+            timer.start()
+
+    def flush(self):
+        """立即发送所有待更新的控件"""
+        with self._lock:
+            controls = list(self._dirty.values())
+            page_dirty = self._page_dirty
+            self._dirty.clear()
+            self._page_dirty = False
+            self._scheduled = False
+
+        if page_dirty:
+            targets = []
+        else:
+            targets = self._roots(controls)
+            if not targets:
+                return
+        try:
+            self.page.update(*targets)
+        except Exception as e:
+            logger.error(f"页面更新失败: {e}")
+            return
+        with self._lock:
+            self._stats["frames"] += 1
+            self._stats["sent"] += len(targets) or 1
+            self._stats["skipped"] += len(controls) - len(targets)
+
+    @staticmethod
+    def _roots(controls):
+        """去掉祖先也待更新的控件和尚未加入页面的控件"""
+        dirty = {id(control) for control in controls}
+        roots = []
+        for control in controls:
+            if control.page is None:
+                continue
+            parent = control.parent
+            while parent is not None and id(parent) not in dirty:
+                parent = parent.parent
+            if parent is None:
+                roots.append(control)
+        return roots
+
+    def stats(self):
+        """帧数、标记次数、实际发送的控件数，以及因祖先已更新或未加入页面而跳过的控件数"""
+        with self._lock:
+            return dict(self._stats)
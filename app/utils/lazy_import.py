@@ -0,0 +1,194 @@
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+
+logger = logging.getLogger(__name__)
+
+# 只在真正用到时才加载的重量级依赖
+HEAVY_MODULES = (
+    "psutil",
+    "pytz",
+    "PIL",
+    "pystray",
+    "apscheduler",
+    "dynaconf",
+    "sqlalchemy",
+)
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# 导入 main 模块的默认耗时预算（毫秒）
+DEFAULT_IMPORT_BUDGET_MS = 1500
+
+_import_timings = {}  # 模块名 -> 首次加载耗时（毫秒）
+_timings_lock = threading.Lock()
+
+
+def _timed_import(module_name):
+    """导入模块并记录首次加载耗时"""
+    already_loaded = module_name in sys.modules
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if not already_loaded:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with _timings_lock:
+            _import_timings[module_name] = elapsed_ms
+        logger.debug(f"延迟加载模块: {module_name} ({elapsed_ms:.1f}ms)")
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """
+    延迟加载的模块代理
+    首次访问属性时才真正导入目标模块
+    """
+
+    def __init__(self, module_name):
+        super().__init__(module_name)
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_target"]
+                if module is None:
+                    module = _timed_import(self.__name__)
+                    self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "已加载" if self.__dict__["_lazy_target"] is not None else "未加载"
+        return f"<LazyModule {self.__name__} ({state})>"
+
+
+class LazyObject:
+    """
+    延迟创建的对象代理
+    首次访问属性时才调用工厂函数创建真实对象
+    """
+
+    def __init__(self, factory, name=None):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_name", name or getattr(factory, "__name__", "object"))
+        object.__setattr__(self, "_lazy_target", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _load(self):
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is None:
+            with object.__getattribute__(self, "_lazy_lock"):
+                target = object.__getattribute__(self, "_lazy_target")
+                if target is None:
+                    started = time.perf_counter()
+                    target = object.__getattribute__(self, "_lazy_factory")()
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    name = object.__getattribute__(self, "_lazy_name")
+                    with _timings_lock:
+                        _import_timings[name] = elapsed_ms
+                    object.__setattr__(self, "_lazy_target", target)
+        return target
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __setattr__(self, key, value):
+        setattr(self._load(), key, value)
+
+    def __getitem__(self, item):
+        return self._load()[item]
+
+    def __repr__(self):
+        name = object.__getattribute__(self, "_lazy_name")
+        return f"<LazyObject {name}>"
+
+
+def lazy_import(module_name):
+    """
+    延迟导入模块
+    使用示例:
+        psutil = lazy_import("psutil")
+        psutil.cpu_percent()  # 此时才真正导入 psutil
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    return LazyModule(module_name)
+
+
+def lazy_object(factory, name=None):
+    """延迟创建对象，首次访问属性时才调用 factory()"""
+    return LazyObject(factory, name)
+
+
+def import_string(path):
+    """
+    按路径导入对象
+    :param path: "包.模块:属性" 形式的路径，如 "app.view.home_view:HomeView"
+    """
+    module_name, _, attr = path.partition(":")
+    module = _timed_import(module_name)
+    return getattr(module, attr) if attr else module
+
+
+def import_timings():
+    """获取已延迟加载的模块及其首次加载耗时（毫秒）"""
+    with _timings_lock:
+        return dict(_import_timings)
+
+
+def measure_import_time(module_name, heavy_modules=HEAVY_MODULES):
+    """
+    在独立的解释器进程中测量模块的冷导入耗时
+    :param module_name: 要测量的模块
+    :param heavy_modules: 需要检查是否被连带加载的重量级模块
+    :return: {"import_ms": 导入耗时, "loaded_heavy": 被连带加载的重量级模块}
+    """
+    script = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module_name}\n"
+        "elapsed_ms = (time.perf_counter() - started) * 1000\n"
+        f"heavy = {list(heavy_modules)!r}\n"
+        "loaded = [m for m in heavy if m in sys.modules]\n"
+        "print(json.dumps({'import_ms': elapsed_ms, 'loaded_heavy': loaded}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=_PROJECT_ROOT,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_import_budget(module_name="main", budget_ms=DEFAULT_IMPORT_BUDGET_MS,
+                        heavy_modules=HEAVY_MODULES):
+    """
+    检查模块冷导入是否满足耗时预算且没有连带加载重量级依赖
+    使用示例:
+        result = check_import_budget("main")
+        assert result["ok"], result
+    """
+    measured = measure_import_time(module_name, heavy_modules)
+    return {
+        "module": module_name,
+        "budget_ms": budget_ms,
+        "import_ms": measured["import_ms"],
+        "loaded_heavy": measured["loaded_heavy"],
+        "ok": measured["import_ms"] <= budget_ms and not measured["loaded_heavy"],
+    }
@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """
+    启动关键路径分析器
+    记录每个启动阶段的耗时，以及首帧和可交互时间点
+    """
+
+    def __init__(self, started_at=None):
+        """
+        :param started_at: 计时起点（time.perf_counter() 的值），默认为创建时刻
+        """
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases = []   # 按完成顺序记录的阶段
+        self.marks = {}    # 时间点名称 -> 距起点的毫秒数
+        self._lock = threading.Lock()
+
+    def _elapsed_ms(self, timestamp=None):
+        """距起点的毫秒数"""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        return (timestamp - self.started_at) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        """
+        记录一个启动阶段
+        使用示例:
+            with profiler.phase("database"):
+                initialize_db_manager()
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.phases.append({
+                    "name": name,
+                    "start_ms": self._elapsed_ms(started),
+                    "duration_ms": (finished - started) * 1000,
+                    "thread": threading.current_thread().name,
+                    "error": error,
+                })
+
+    def mark(self, name):
+        """记录一个关键时间点"""
+        with self._lock:
+            self.marks[name] = self._elapsed_ms()
+
+    def mark_first_frame(self):
+        """记录首帧时间"""
+        self.mark("first_frame")
+
+    @property
+    def first_frame_ms(self):
+        """首帧时间（毫秒），尚未绘制时为 None"""
+        return self.marks.get("first_frame")
+
+    def report(self):
+        """
+        获取启动耗时报告
+        :return: 包含首帧时间、各时间点和各阶段耗时的字典
+        """
+        with self._lock:
+            phases = list(self.phases)
+            marks = dict(self.marks)
+        total_ms = max((p["start_ms"] + p["duration_ms"] for p in phases), default=0.0)
+        return {
+            "first_frame_ms": marks.get("first_frame"),
+            "total_ms": total_ms,
+            "marks": marks,
+            "phases": phases,
+        }
+
+    def log_report(self):
+        """将启动耗时报告写入日志"""
+        report = self.report()
+        lines = [f"启动耗时报告: 首帧 {report['first_frame_ms'] or 0:.1f}ms, 总计 {report['total_ms']:.1f}ms"]
+        for name, at_ms in report["marks"].items():
+            lines.append(f"  [时间点] {name:<16} @{at_ms:8.1f}ms")
+        for p in report["phases"]:
+            status = f" 失败: {p['error']}" if p["error"] else ""
+            lines.append(
+                f"  [阶段] {p['name']:<16} {p['duration_ms']:8.1f}ms "
+                f"(@{p['start_ms']:.1f}ms, {p['thread']}){status}"
+            )
+        logger.info("\n".join(lines))
+        return report
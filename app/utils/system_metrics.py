@@ -0,0 +1,190 @@
+import atexit
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from app.config.global_config import GlobalConfig
+from app.utils.lazy_import import lazy_import
+
+psutil = lazy_import("psutil")
+
+logger = logging.getLogger(__name__)
+
+_instance_lock = threading.Lock()
+
+# 可选的耗时采集项，只有订阅者需要时才采集
+PROBE_PIDS = "pids"  # 枚举全部进程统计进程数
+
+SystemSnapshot = namedtuple("SystemSnapshot", [
+    "sampled_at",       # 采集时刻（time.time()）
+    "cpu_percent",
+    "cpu_freq_mhz",     # 无法获取时为 None
+    "memory_percent",
+    "memory_used",      # 字节
+    "memory_total",     # 字节
+    "disk_percent",
+    "process_count",    # 未采集时为 None
+    "net_sent",         # 字节
+    "net_recv",         # 字节
+    "battery_percent",  # 没有电池时为 None
+    "battery_plugged",
+    "boot_time",        # 时间戳，只采集一次
+])
+
+
+class SystemMetricsSampler:
+    """
+    系统指标采样器
+    在后台线程中按固定间隔采集一次系统指标，生成不可变的快照后整体替换，
+    读取方直接读取 snapshot 属性，不需要加锁，也不会在界面线程中调用 psutil：
+    - 没有订阅者时暂停采集
+    - 启动时间等不变的值只采集一次
+    - 进程枚举等耗时项只在订阅者需要时采集，并且每 slow_every 次采集一次
+    使用示例:
+        sampler = get_system_metrics_sampler()
+        sampler.subscribe(on_metrics, probes=[PROBE_PIDS])  # on_metrics(snapshot) 在采样线程中调用
+        sampler.unsubscribe(on_metrics)
+    """
+
+    def __init__(self, interval=2.0, disk_path="/", slow_every=5):
+        """
+        :param interval: 采集间隔（秒）
+        :param disk_path: 统计磁盘使用率的路径
+        :param slow_every: 耗时采集项每隔多少次采集执行一次
+        """
+        self.interval = interval
+        self.disk_path = disk_path
+        self.slow_every = slow_every
+        self.snapshot = None
+        self._subscribers = {}  # 回调 -> 需要的可选采集项
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()  # refresh() 与采样线程不同时采集
+        self._active = threading.Event()  # 有订阅者时置位
+        self._closed = threading.Event()
+        self._thread = None
+        self._boot_time = None
+        self._samples = 0
+        self._process_count = None
+
+    # ---- 订阅 ----
+    def subscribe(self, callback, probes=()):
+        """
+        订阅指标，首个订阅者加入时开始采集
+        :param callback: callback(snapshot)，每次采集后在采样线程中调用
+        :param probes: 需要的可选采集项，如 PROBE_PIDS
+        """
+        with self._lock:
+            self._subscribers[callback] = frozenset(probes)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SystemMetricsSampler", daemon=True)
+                self._thread.start()
+            self._active.set()
+
+    def unsubscribe(self, callback):
+        """取消订阅，没有订阅者时暂停采集"""
+        with self._lock:
+            self._subscribers.pop(callback, None)
+            if not self._subscribers:
+                self._active.clear()
+
+    @property
+    def paused(self):
+        """是否因为没有订阅者而暂停"""
+        return not self._active.is_set()
+
+    def close(self):
+        """停止采样线程"""
+        self._closed.set()
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    # ---- 采集 ----
+    def refresh(self):
+        """立即采集一次并通知订阅者，返回新的快照"""
+        with self._lock:
+            subscribers = dict(self._subscribers)
+        probes = frozenset().union(*subscribers.values())
+        snapshot = self._sample(probes, force_slow=True)
+        self._notify(subscribers, snapshot)
+        return snapshot
+
+    def _run(self):
+        psutil.cpu_percent()  # 第一次调用只建立基准，返回值无意义
+        while True:
+            self._active.wait()
+            if self._closed.is_set():
+                return
+            with self._lock:
+                subscribers = dict(self._subscribers)
+            if subscribers:
+                probes = frozenset().union(*subscribers.values())
+                try:
+                    snapshot = self._sample(probes)
+                except Exception as e:
+                    logger.error(f"采集系统指标失败: {e}")
+                else:
+                    self._notify(subscribers, snapshot)
+            if self._closed.wait(self.interval):
+                return
+
+    def _sample(self, probes, force_slow=False):
+        """
+        采集一次指标，生成新快照并替换
+        采集互斥执行，cpu_percent 按两次调用之间的间隔计算，同时采集会使其中一次的间隔接近 0
+        """
+        with self._sample_lock:
+            return self._sample_locked(probes, force_slow)
+
+    def _sample_locked(self, probes, force_slow):
+        if self._boot_time is None:
+            self._boot_time = psutil.boot_time()
+
+        slow = force_slow or self._samples % self.slow_every == 0
+        self._samples += 1
+        if PROBE_PIDS in probes and (slow or self._process_count is None):
+            self._process_count = len(psutil.pids())
+
+        memory = psutil.virtual_memory()
+        cpu_freq = psutil.cpu_freq()
+        net_io = psutil.net_io_counters()
+        battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+
+        snapshot = SystemSnapshot(
+            sampled_at=time.time(),
+            cpu_percent=psutil.cpu_percent(),
+            cpu_freq_mhz=cpu_freq.current if cpu_freq else None,
+            memory_percent=memory.percent,
+            memory_used=memory.used,
+            memory_total=memory.total,
+            disk_percent=psutil.disk_usage(self.disk_path).percent,
+            process_count=self._process_count if PROBE_PIDS in probes else None,
+            net_sent=net_io.bytes_sent,
+            net_recv=net_io.bytes_recv,
+            battery_percent=battery.percent if battery else None,
+            battery_plugged=battery.power_plugged if battery else None,
+            boot_time=self._boot_time,
+        )
+        self.snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def _notify(subscribers, snapshot):
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"系统指标回调失败: {e}")
+
+
+def get_system_metrics_sampler():
+    """获取进程内共享的系统指标采样器"""
+    if GlobalConfig.metrics_sampler is None:
+        with _instance_lock:
+            if GlobalConfig.metrics_sampler is None:
+                sampler = SystemMetricsSampler()
+                atexit.register(sampler.close)
+                GlobalConfig.metrics_sampler = sampler
+    return GlobalConfig.metrics_sampler
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 这些模块中的调用栈帧不作为调用位置（Flet 内部和本模块）
+_SKIPPED_MODULES = ("flet", "flet_core", __name__)
+
+
+class UpdateProfiler:
+    """
+    页面更新流量分析器
+    包装页面实例的 update 和内部的更新命令生成方法，记录每次 page.update() / control.update()：
+    - 调用位置（应用代码中的文件、行号和函数）及所属视图
+    - 参与比对的控件数、生成的命令数和发送给客户端的数据量（字节）
+    - 耗时
+    按视图汇总后输出最耗费的更新，用于排查开销大的重绘
+    使用示例:
+        profiler = UpdateProfiler(page)
+        profiler.install()
+        ...
+        profiler.log_report()
+    """
+
+    def __init__(self, page, view_resolver=None, max_records=5000):
+        """
+        :param page: Flet 页面
+        :param view_resolver: view_resolver(control) -> 视图名称，调用栈中找不到视图时
+                              （如帧调度器统一发送的更新）按控件所属视图归类
+        :param max_records: 最多保留的明细记录数，超出后丢弃最早的记录
+        """
+        self.page = page
+        self.view_resolver = view_resolver
+        self.max_records = max_records
+        self.records = []
+        self._lock = threading.Lock()
+        self._current = threading.local()  # 当前线程正在记录的更新
+        self._original_update = None
+        self._original_prepare = None
+        self._encoder = None
+
+    # ---- 安装 ----
+    @property
+    def installed(self):
+        return self._original_update is not None
+
+    def install(self):
+        """
+        包装页面的更新方法，只影响当前页面实例
+        依赖 Flet 0.2x 的内部实现（Page.__prepare_update 和 CommandEncoder），
+        当前版本没有这些接口时记录警告并跳过，不影响应用运行
+        """
+        if self.installed:
+            return self
+        page = self.page
+        try:
+            from flet_core.protocol import CommandEncoder
+        except ImportError:
+            CommandEncoder = None
+        if CommandEncoder is None or not hasattr(page, "_Page__prepare_update"):
+            logger.warning("当前 Flet 版本不支持页面更新分析，已跳过")
+            return self
+        self._encoder = CommandEncoder
+        self._original_update = page.update
+        self._original_prepare = page._Page__prepare_update
+
+        def update(*controls):
+            self._profile_update(controls)
+
+        def prepare_update(*controls):
+            return self._profile_prepare(controls)
+
+        page.update = update
+        page._Page__prepare_update = prepare_update
+        logger.info("页面更新分析已启用")
+        return self
+
+    def uninstall(self):
+        """恢复页面原来的更新方法"""
+        if not self.installed:
+            return
+        del self.page.update
+        del self.page._Page__prepare_update
+        self._original_update = self._original_prepare = None
+
+    # ---- 记录 ----
+    def _profile_update(self, controls):
+        call_site, view = self._caller()
+        if view is None:
+            view = self._resolve_view(controls)
+        record = {
+            "view": view,
+            "call_site": call_site,
+            "targets": len(controls) or 1,  # 为空时表示整个页面
+            "controls": 0,
+            "commands": 0,
+            "bytes": 0,
+        }
+        self._current.record = record
+        started = time.perf_counter()
+        try:
+            self._original_update(*controls)
+        finally:
+            record["wall_ms"] = (time.perf_counter() - started) * 1000
+            self._current.record = None
+            with self._lock:
+                self.records.append(record)
+                if len(self.records) > self.max_records:
+                    del self.records[:len(self.records) - self.max_records]
+
+    def _profile_prepare(self, controls):
+        commands, added, removed = self._original_prepare(*controls)
+        record = getattr(self._current, "record", None)
+        if record is not None:
+            record["controls"] += sum(_count_controls(control) for control in controls)
+            record["commands"] += len(commands)
+            record["bytes"] += len(json.dumps(commands, cls=self._encoder, separators=(",", ":")))
+        return commands, added, removed
+
+    @staticmethod
+    def _caller():
+        """
+        第一个不属于 Flet 和本模块的调用栈帧
+        :return: (调用位置, 视图类名)，调用方不是视图或组件方法时视图为 None
+        """
+        frame = sys._getframe(3)
+        while frame is not None and _is_skipped(frame.f_globals.get("__name__", "")):
+            frame = frame.f_back
+        if frame is None:
+            return "<unknown>", None
+        code = frame.f_code
+        call_site = f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+        module = frame.f_globals.get("__name__", "")
+        owner = frame.f_locals.get("self")
+        if owner is not None and module.startswith(("app.view", "app.component")):
+            return call_site, type(owner).__name__
+        return call_site, None
+
+    def _resolve_view(self, controls):
+        if not controls:
+            return "Page"
+        if self.view_resolver is not None:
+            for control in controls:
+                view = self.view_resolver(control)
+                if view is not None:
+                    return view
+        return "<unknown>"
+
+    # ---- 报告 ----
+    def report(self, top_n=10):
+        """
+        按视图汇总的更新统计，按数据量降序
+        :param top_n: 每个视图保留数据量最大的调用位置数，同时限制返回的视图数
+        :return: [{view, updates, controls, bytes, wall_ms, max_ms, call_sites: [...]}]
+        """
+        with self._lock:
+            records = list(self.records)
+
+        views = {}
+        for record in records:
+            view = views.setdefault(record["view"], {
+                "view": record["view"], "updates": 0, "controls": 0, "bytes": 0,
+                "wall_ms": 0.0, "max_ms": 0.0, "call_sites": {},
+            })
+            site = view["call_sites"].setdefault(record["call_site"], {
+                "call_site": record["call_site"], "updates": 0, "controls": 0, "bytes": 0, "wall_ms": 0.0,
+            })
+            for target in (view, site):
+                target["updates"] += 1
+                target["controls"] += record["controls"]
+                target["bytes"] += record["bytes"]
+                target["wall_ms"] += record["wall_ms"]
+            view["max_ms"] = max(view["max_ms"], record["wall_ms"])
+
+        result = sorted(views.values(), key=lambda v: v["bytes"], reverse=True)[:top_n]
+        for view in result:
+            view["call_sites"] = sorted(
+                view["call_sites"].values(), key=lambda s: s["bytes"], reverse=True
+            )[:top_n]
+        return result
+
+    def log_report(self, top_n=10):
+        """输出更新统计报告"""
+        report = self.report(top_n)
+        if not report:
+            logger.info("页面更新统计: 无记录")
+            return
+        lines = ["页面更新统计（按数据量排序）:"]
+        for view in report:
+            lines.append(
+                f"  {view['view']}: {view['updates']} 次, 比对 {view['controls']} 个控件, "
+                f"{view['bytes'] / 1024:.1f}KB, 共 {view['wall_ms']:.1f}ms, 最长 {view['max_ms']:.1f}ms"
+            )
+            for site in view["call_sites"]:
+                lines.append(
+                    f"    {site['call_site']}: {site['updates']} 次, "
+                    f"{site['bytes'] / 1024:.1f}KB, {site['wall_ms']:.1f}ms"
+                )
+        logger.info("\n".join(lines))
+
+
+def _is_skipped(module):
+    return any(module == name or module.startswith(name + ".") for name in _SKIPPED_MODULES)
+
+
+def _count_controls(control):
+    """控件子树中的控件数，即一次更新需要比对的控件数"""
+    count = 0
+    stack = [control]
+    while stack:
+        current = stack.pop()
+        count += 1
+        stack.extend(current._get_children())
+    return count
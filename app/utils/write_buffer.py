@@ -0,0 +1,81 @@
+import logging
+import threading
+
+from app.utils.debounce import Debouncer
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer:
+    """
+    写入缓冲区
+    按键合并变更，防抖到期或显式 flush 时在后台线程中一次性交给 writer 写出
+    使用示例:
+        buffer = WriteBuffer(lambda changes: save(changes), delay=0.5)
+        buffer.set("opacity", 0.8)   # 多次调用只保留最后的值
+        buffer.flush()               # 立即在后台写出
+    """
+
+    def __init__(self, writer, delay=0.5, max_wait=2.0, name="WriteBuffer"):
+        """
+        :param writer: 写出函数，签名为 writer(changes: dict)
+        :param delay: 最后一次变更后等待的秒数
+        :param max_wait: 持续变更时最长等待的秒数
+        :param name: 后台线程名称
+        """
+        self.writer = writer
+        self.name = name
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # 保证写出按顺序进行
+        self._debouncer = Debouncer(self._write, delay, max_wait)
+
+    def set(self, key, value):
+        """记录一项变更，同一键只保留最后的值"""
+        with self._lock:
+            self._pending[key] = value
+        self._debouncer.trigger()
+
+    def update(self, changes: dict):
+        """记录多项变更"""
+        with self._lock:
+            self._pending.update(changes)
+        self._debouncer.trigger()
+
+    @property
+    def pending(self):
+        """尚未写出的变更"""
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self, wait=False):
+        """
+        立即写出所有变更
+        :param wait: 是否等待写出完成，默认在后台线程中写出
+        """
+        self._debouncer.cancel()
+        if wait:
+            self._write()
+        else:
+            threading.Thread(target=self._write, name=self.name, daemon=True).start()
+
+    def discard(self):
+        """丢弃尚未写出的变更"""
+        self._debouncer.cancel()
+        with self._lock:
+            self._pending.clear()
+
+    def close(self):
+        """写出剩余变更，用于对话框关闭或应用退出"""
+        self.flush(wait=True)
+
+    def _write(self):
+        with self._write_lock:
+            with self._lock:
+                changes, self._pending = self._pending, {}
+            if not changes:
+                return
+            try:
+                self.writer(changes)
+            except Exception as e:
+                logger.error(f"{self.name} 写出失败: {e}")
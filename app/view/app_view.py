@@ -1,14 +1,8 @@
 import flet as ft
 
 from app.component.TrayIconManager import TrayIconManager
-from app.view.home_view import HomeView
-from app.view.settings_view import SettingsView
-from app.view.basic_components_view import BasicComponentsView
-from app.view.layout_components_view import LayoutComponentsView
-from app.view.form_components_view import FormComponentsView
-from app.view.data_components_view import DataComponentsView
-from app.view.feedback_components_view import FeedbackComponentsView
-from app.view.task_view import TaskView
+from app.utils.frame_scheduler import FrameScheduler
+from app.view.view_registry import ViewPolicy, ViewRegistry
 
 
 class AppView:
@@ -18,6 +12,7 @@ class AppView:
         self.page = page
         self.viewmodel = viewmodel
         self.tray_manager = TrayIconManager(page)
+        self.frames = FrameScheduler.for_page(page)
 
         # 订阅事件
         self.viewmodel.subscribe("theme_changed", self._on_theme_changed)
@@ -33,18 +28,17 @@ class AppView:
         # 当前选中的导航项
         self.current_nav_index = 0
 
-        # 初始化所有视图
-        self.views = {
-            "home": HomeView(page, viewmodel),
-            "basic": BasicComponentsView(page, viewmodel),
-            "layout": LayoutComponentsView(page, viewmodel),
-            "form": FormComponentsView(page, viewmodel),
-            "data": DataComponentsView(page, viewmodel),
-            "feedback": FeedbackComponentsView(page, viewmodel),
-            "settings": SettingsView(page, viewmodel),
-            "task": TaskView(page, viewmodel),
-        }
-        
+        # 注册视图，首次导航时才导入模块并构建
+        self.views = ViewRegistry(page, viewmodel, capacity=3)
+        self.views.register("home", "app.view.home_view:HomeView", ViewPolicy.PIN)
+        self.views.register("basic", "app.view.basic_components_view:BasicComponentsView")
+        self.views.register("layout", "app.view.layout_components_view:LayoutComponentsView")
+        self.views.register("form", "app.view.form_components_view:FormComponentsView")
+        self.views.register("data", "app.view.data_components_view:DataComponentsView")
+        self.views.register("feedback", "app.view.feedback_components_view:FeedbackComponentsView")
+        self.views.register("settings", "app.view.settings_view:SettingsView")
+        self.views.register("task", "app.view.task_view:TaskView", ViewPolicy.PIN)
+
         # 当前视图
         self.current_view = "home"
         self.content_area = None
@@ -60,15 +54,21 @@ class AppView:
         self.page.clean()
         self.page.add(main_layout)
         self.page.update()
-        
-        # 启动托盘图标
+        self.views.get(self.current_view).on_show()
+
+    def start_tray(self):
+        """启动托盘图标"""
         self.tray_manager.start()
 
+    def prewarm_views(self):
+        """在后台预先构建常用但不可见的视图"""
+        self.views.prewarm("task", "settings")
+
     def _build_view(self):
         """构建主视图"""
         # 创建内容区域
         self.content_area = ft.Container(
-            content=self.views[self.current_view].view,
+            content=self.views.get(self.current_view).view,
             expand=True,
             animate_opacity=300,
         )
@@ -156,8 +156,8 @@ class AppView:
         """主题变化回调"""
         # 更新页面主题
         self.page.theme_mode = ft.ThemeMode.DARK if theme == "dark" else ft.ThemeMode.LIGHT
-        # 只更新页面，不单独更新控件
-        self.page.update()
+        # 主题属于页面属性，下一帧更新页面
+        self.frames.mark_dirty()
 
     def _on_nav_changed(self, index):
         """导航选择变化回调"""
@@ -177,14 +177,22 @@ class AppView:
         
         # 如果视图确实发生了变化
         if new_view != self.current_view:
+            previous_view = self.current_view
+            hidden = self.views.peek(previous_view)
+            if hidden is not None:
+                hidden.on_hide()
+
             # 更新当前视图
             self.current_view = new_view
-            
-            # 使用动画切换内容
+            view = self.views.get(self.current_view)
+            self.views.release(previous_view)
+
+            # 使用动画切换内容，只发送内容区域子树
             self.content_area.opacity = 0
-            self.content_area.content = self.views[self.current_view].view
-            self.page.update()
-            
-            # 设置淡入效果
+            self.content_area.content = view.view
+            self.content_area.update()
+
+            # 淡入放到下一帧，与透明状态分开发送
             self.content_area.opacity = 1
-            self.content_area.update()
\ No newline at end of file
+            self.frames.mark_dirty(self.content_area)
+            view.on_show()
\ No newline at end of file
@@ -1,5 +1,7 @@
 import flet as ft
 
+from app.utils.frame_scheduler import FrameScheduler
+
 
 class BaseView:
     """基础视图类，封装通用功能"""
@@ -7,3 +9,22 @@ class BaseView:
     def __init__(self, page: ft.Page, viewmodel):
         self.page = page
         self.viewmodel = viewmodel
+
+    def request_update(self, *controls):
+        """
+        请求在下一帧更新控件，代替直接调用 page.update()
+        :param controls: 发生变化的控件，为空时更新整个页面
+        """
+        FrameScheduler.for_page(self.page).mark_dirty(*controls)
+
+    def on_show(self):
+        """视图切换到前台后调用"""
+        pass
+
+    def on_hide(self):
+        """视图离开前台时调用"""
+        pass
+
+    def dispose(self):
+        """视图被注册表释放时调用，用于清理资源"""
+        pass
@@ -1,7 +1,7 @@
 import flet as ft
 from app.view.base_view import BaseView
 import platform
-import psutil
+from app.utils.system_metrics import PROBE_PIDS, get_system_metrics_sampler
 from datetime import datetime
 
 
@@ -16,10 +16,22 @@ class HomeView(BaseView):
         self.battery_text = ft.Text("获取中...", size=14)
         self.boot_text = ft.Text("获取中...", size=14)
         
+        # 系统指标由后台采样器采集，视图可见时才订阅
+        self.sampler = get_system_metrics_sampler()
         self.view = self._build_view()
-        # 添加定时更新
-        self.page.on_interval = self._update_system_info
-        self.page.update_interval = 2000  # 2秒更新一次
+
+    def on_show(self):
+        """显示时订阅系统指标，先用最近的快照填充"""
+        if self.sampler.snapshot is not None:
+            self._update_system_info(self.sampler.snapshot)
+        self.sampler.subscribe(self._update_system_info, probes=[PROBE_PIDS])
+
+    def on_hide(self):
+        """隐藏时取消订阅，没有其他订阅者时采样器暂停"""
+        self.sampler.unsubscribe(self._update_system_info)
+
+    def dispose(self):
+        self.sampler.unsubscribe(self._update_system_info)
 
     def _build_view(self):
         return ft.Container(
@@ -31,7 +43,7 @@ class HomeView(BaseView):
                         ft.IconButton(
                             icon=ft.icons.REFRESH,
                             tooltip="刷新",
-                            on_click=lambda _: self._update_system_info(),
+                            on_click=lambda _: self.sampler.refresh(),
                         ),
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                     margin=ft.margin.only(bottom=20)
@@ -132,67 +144,51 @@ class HomeView(BaseView):
             trailing=ft.Text(time, size=12, color=ft.colors.GREY),
         )
 
-    def _update_system_info(self):
-        """更新系统信息"""
+    def _update_system_info(self, snapshot):
+        """根据采样快照更新系统信息，在采样线程中调用"""
         try:
             # 更新卡片数据
             cards = self.view.content.controls[1].controls
-            
-            # CPU使用率
-            cpu_percent = psutil.cpu_percent()
-            cards[0].content.content.controls[1].value = f"{cpu_percent}%"
-            
-            # 内存使用率
-            memory = psutil.virtual_memory()
-            cards[1].content.content.controls[1].value = f"{memory.percent}%"
-            
-            # 磁盘使用率
-            disk = psutil.disk_usage('/')
-            cards[2].content.content.controls[1].value = f"{disk.percent}%"
-            
-            # 进程数
-            process_count = len(psutil.pids())
-            cards[3].content.content.controls[1].value = str(process_count)
+            cards[0].content.content.controls[1].value = f"{snapshot.cpu_percent}%"
+            cards[1].content.content.controls[1].value = f"{snapshot.memory_percent}%"
+            cards[2].content.content.controls[1].value = f"{snapshot.disk_percent}%"
+            if snapshot.process_count is not None:
+                cards[3].content.content.controls[1].value = str(snapshot.process_count)
 
             # 更新性能监控
             performance_info = []
-            
-            # CPU详细信息
-            cpu_freq = psutil.cpu_freq()
-            if cpu_freq:
-                performance_info.append(
-                    f"CPU频率: {cpu_freq.current:.1f}MHz"
-                )
-            
-            # 内存详细信息
-            memory_info = psutil.virtual_memory()
+            if snapshot.cpu_freq_mhz is not None:
+                performance_info.append(f"CPU频率: {snapshot.cpu_freq_mhz:.1f}MHz")
             performance_info.append(
-                f"内存使用: {memory_info.used/1024/1024/1024:.1f}GB/"
-                f"{memory_info.total/1024/1024/1024:.1f}GB"
+                f"内存使用: {snapshot.memory_used/1024/1024/1024:.1f}GB/"
+                f"{snapshot.memory_total/1024/1024/1024:.1f}GB"
             )
-            
             self.performance_text.value = "\n".join(performance_info)
 
             # 网络信息
-            net_io = psutil.net_io_counters()
             self.network_text.value = (
-                f"网络流量: ↑{net_io.bytes_sent/1024/1024:.1f}MB "
-                f"↓{net_io.bytes_recv/1024/1024:.1f}MB"
+                f"网络流量: ↑{snapshot.net_sent/1024/1024:.1f}MB "
+                f"↓{snapshot.net_recv/1024/1024:.1f}MB"
             )
 
             # 电池信息
-            if hasattr(psutil, "sensors_battery"):
-                battery = psutil.sensors_battery()
-                if battery:
-                    self.battery_text.value = (
-                        f"电池: {battery.percent}% "
-                        f"({'充电中' if battery.power_plugged else '使用电池'})"
-                    )
+            if snapshot.battery_percent is not None:
+                self.battery_text.value = (
+                    f"电池: {snapshot.battery_percent}% "
+                    f"({'充电中' if snapshot.battery_plugged else '使用电池'})"
+                )
 
             # 启动时间
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            boot_time = datetime.fromtimestamp(snapshot.boot_time)
             self.boot_text.value = f"启动时间: {boot_time.strftime('%Y-%m-%d %H:%M:%S')}"
 
-            self.page.update()
+            # 只更新数值文本，不重新比对整个页面
+            self.request_update(
+                *(card.content.content.controls[1] for card in cards),
+                self.performance_text,
+                self.network_text,
+                self.battery_text,
+                self.boot_text,
+            )
         except Exception as e:
-            print(f"更新系统信息失败: {e}") 
\ No newline at end of file
+            print(f"更新系统信息失败: {e}")
@@ -9,6 +9,10 @@ class SettingsView(BaseView):
         super().__init__(page, viewmodel)
         self.view = self._build_view()
 
+    def on_hide(self):
+        """离开设置页时立即写出尚未保存的设置"""
+        self.viewmodel.flush_settings()
+
     def _build_view(self):
         return ft.Container(
             content=ft.Column([
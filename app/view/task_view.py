@@ -1,20 +1,45 @@
 import flet as ft
 from app.view.base_view import BaseView
-from app.tasks.SchedulerManager import SchedulerManager
 from datetime import datetime
-import pytz  # 添加时区支持
+from app.utils.lazy_import import lazy_import
+
+pytz = lazy_import("pytz")  # 添加时区支持，首次使用时加载
 
 class TaskView(BaseView):
     """任务管理视图"""
 
+    PAGE_SIZE = 50  # 每页渲染的最大任务行数
+
     def __init__(self, page: ft.Page, viewmodel):
         super().__init__(page, viewmodel)
-        self.scheduler = SchedulerManager()
-        self.scheduler.start()  # 启动调度器
+        self.scheduler = viewmodel.scheduler  # 使用共享调度器
         self.tasks_data = None  # 保存表格引用
+        self.page_label = None  # 分页信息
+        self.page_index = 0  # 当前页码（从 0 开始）
+        self._row_cache = {}  # job_id -> (行签名, DataRow)，只重建发生变化的行
+        self._empty_row = None
+        self._local_tz = None
+        self._visible = False
         self.view = self._build_view()
-        # 初始化后立即加载任务列表
-        self.page.on_load = lambda _: self.refresh_tasks()
+
+        # 调度器事件驱动刷新，视图不可见时跳过
+        self.viewmodel.subscribe("jobs_changed", self._on_jobs_changed)
+
+    def on_show(self):
+        """切换到任务视图时加载任务列表"""
+        self._visible = True
+        self.refresh_tasks()
+
+    def on_hide(self):
+        self._visible = False
+
+    def dispose(self):
+        self.viewmodel.unsubscribe("jobs_changed", self._on_jobs_changed)
+
+    def _on_jobs_changed(self):
+        """任务变化回调，不可见时由 on_show 负责刷新"""
+        if self._visible:
+            self.refresh_tasks()
 
     def _build_view(self):
         return ft.Container(
@@ -94,7 +119,7 @@ class TaskView(BaseView):
             cron_settings.visible = trigger_type.value == "cron"
             interval_settings.visible = trigger_type.value == "interval"
             date_settings.visible = trigger_type.value == "date"
-            self.page.update()
+            self.request_update(cron_settings, interval_settings, date_settings)
 
         # 创建编辑表单
         task_name = ft.TextField(
@@ -166,11 +191,15 @@ class TaskView(BaseView):
                 ft.DataColumn(ft.Text("触发器")),
                 ft.DataColumn(ft.Text("下次执行时间")),
                 ft.DataColumn(ft.Text("状态")),
+                ft.DataColumn(ft.Text("平均耗时")),
+                ft.DataColumn(ft.Text("执行/失败")),
                 ft.DataColumn(ft.Text("操作")),
             ],
             rows=[],
         )
 
+        self.page_label = ft.Text("", size=14, color=ft.colors.GREY_700)
+
         # 构建布局
         return ft.Column([
             ft.Row([
@@ -181,6 +210,19 @@ class TaskView(BaseView):
                 ),
             ], alignment=ft.MainAxisAlignment.END),
             self.tasks_data,
+            ft.Row([
+                ft.IconButton(
+                    icon=ft.icons.CHEVRON_LEFT,
+                    tooltip="上一页",
+                    on_click=lambda _: self.change_page(-1),
+                ),
+                self.page_label,
+                ft.IconButton(
+                    icon=ft.icons.CHEVRON_RIGHT,
+                    tooltip="下一页",
+                    on_click=lambda _: self.change_page(1),
+                ),
+            ], alignment=ft.MainAxisAlignment.CENTER),
         ], spacing=20)
 
     def _build_add_task(self):
@@ -195,21 +237,24 @@ class TaskView(BaseView):
                         func=self.scheduler.execute_task,
                         cron_rule=f"{cron_minute.value} {cron_hour.value} * * *",
                         args=[task_name.value, task_name.value],
-                        job_id=f"task_{task_name.value}"
+                        job_id=f"task_{task_name.value}",
+                        executor=executor_type.value,
                     )
                 elif trigger_type.value == "interval":
                     self.scheduler.add_interval_job(
                         func=self.scheduler.execute_task,
                         hours=int(interval_hours.value),
                         args=[task_name.value, task_name.value],
-                        job_id=f"task_{task_name.value}"
+                        job_id=f"task_{task_name.value}",
+                        executor=executor_type.value,
                     )
                 elif trigger_type.value == "date":
                     self.scheduler.add_date_job(
                         func=self.scheduler.execute_task,
                         run_date=date_time.value,
                         args=[task_name.value, task_name.value],
-                        job_id=f"task_{task_name.value}"
+                        job_id=f"task_{task_name.value}",
+                        executor=executor_type.value,
                     )
 
                 self.page.show_snack_bar(
@@ -225,8 +270,8 @@ class TaskView(BaseView):
                     interval_hours.value = "1"
                 else:
                     date_time.value = ""
-                
-                self.page.update()
+
+                self.request_update(task_name, cron_hour, cron_minute, interval_hours, date_time)
                 self.refresh_tasks()  # 使用类方法刷新
                 
             except ValueError as e:
@@ -243,7 +288,7 @@ class TaskView(BaseView):
             cron_settings.visible = trigger_type.value == "cron"
             interval_settings.visible = trigger_type.value == "interval"
             date_settings.visible = trigger_type.value == "date"
-            self.page.update()
+            self.request_update(cron_settings, interval_settings, date_settings)
 
         task_name = ft.TextField(
             label="任务名称",
@@ -263,6 +308,17 @@ class TaskView(BaseView):
             on_change=update_form_visibility,  # 添加切换事件
         )
 
+        # 执行方式：CPU 密集型任务选择进程池，避免阻塞 UI 线程
+        executor_type = ft.Dropdown(
+            label="执行方式",
+            options=[
+                ft.dropdown.Option(self.scheduler.EXECUTOR_THREAD, "线程池"),
+                ft.dropdown.Option(self.scheduler.EXECUTOR_PROCESS, "进程池 (CPU 密集型)"),
+                ft.dropdown.Option(self.scheduler.EXECUTOR_ASYNCIO, "事件循环 (协程)"),
+            ],
+            value=self.scheduler.EXECUTOR_THREAD,
+        )
+
         # Cron 触发器选项
         cron_hour = ft.TextField(label="小时 (0-23)", value="8")
         cron_minute = ft.TextField(label="分钟 (0-59)", value="0")
@@ -290,6 +346,7 @@ class TaskView(BaseView):
             content=ft.Column([
                 task_name,
                 trigger_type,
+                executor_type,
                 ft.Divider(),
                 ft.Text("触发器设置:", size=16, weight=ft.FontWeight.BOLD),
                 cron_settings,
@@ -304,90 +361,78 @@ class TaskView(BaseView):
             padding=20,
         )
 
+    @property
+    def local_tz(self):
+        """本地时区，首次使用时创建"""
+        if self._local_tz is None:
+            self._local_tz = pytz.timezone('Asia/Shanghai')
+        return self._local_tz
+
     def get_task_status(self, job):
         """获取任务状态"""
         if job.next_run_time is None:
             return "已暂停", ft.colors.GREY
         
         # 转换为本地时间进行比较
-        local_tz = pytz.timezone('Asia/Shanghai')
-        now = datetime.now(local_tz)
+        now = datetime.now(self.local_tz)
         
         if job.next_run_time > now:
             return "运行中", ft.colors.GREEN
         else:
             return "已过期", ft.colors.RED
 
+    def change_page(self, delta):
+        """翻页"""
+        self.page_index = max(self.page_index + delta, 0)
+        self.refresh_tasks()
+
     def refresh_tasks(self):
-        """刷新任务列表"""
+        """
+        刷新任务列表
+        按 job_id 对比行签名，只重建发生变化的行，并且只更新表格和分页控件
+        """
         try:
             if not self.tasks_data:
                 return
-                
-            self.tasks_data.rows = []
+
             jobs = self.scheduler.get_jobs()
-            
-            if not jobs:
+            page_count = max((len(jobs) + self.PAGE_SIZE - 1) // self.PAGE_SIZE, 1)
+            self.page_index = min(self.page_index, page_count - 1)
+            start = self.page_index * self.PAGE_SIZE
+            visible_jobs = jobs[start:start + self.PAGE_SIZE]
+
+            if not visible_jobs:
                 # 如果没有任务，显示空状态
-                self.tasks_data.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text("暂无任务")),
-                            ft.DataCell(ft.Text("")),
-                            ft.DataCell(ft.Text("")),
-                            ft.DataCell(ft.Text("")),
-                            ft.DataCell(ft.Text("")),
-                            ft.DataCell(ft.Text("")),
-                        ],
-                    )
-                )
+                rows = [self._get_empty_row()]
+                self._row_cache.clear()
             else:
-                for job in jobs:
-                    status, color = self.get_task_status(job)
-                    self.tasks_data.rows.append(
-                        ft.DataRow(
-                            cells=[
-                                ft.DataCell(ft.Text(job.id)),
-                                ft.DataCell(ft.Text(job.args[1] if job.args else "未命名")),
-                                ft.DataCell(ft.Text(str(job.trigger))),
-                                ft.DataCell(ft.Text(
-                                    job.next_run_time.astimezone(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-                                    if job.next_run_time else "无"
-                                )),
-                                ft.DataCell(
-                                    ft.Container(
-                                        content=ft.Text(status, color=ft.colors.WHITE),
-                                        bgcolor=color,
-                                        padding=5,
-                                        border_radius=5,
-                                    )
-                                ),
-                                ft.DataCell(
-                                    ft.Row([
-                                        ft.IconButton(
-                                            icon=ft.icons.EDIT,
-                                            icon_color=ft.colors.BLUE,
-                                            tooltip="编辑",
-                                            on_click=lambda _, x=job: self.show_edit_dialog(x),
-                                        ),
-                                        ft.IconButton(
-                                            icon=ft.icons.PAUSE if status == "运行中" else ft.icons.PLAY_ARROW,
-                                            icon_color=ft.colors.BLUE,
-                                            tooltip="暂停/恢复",
-                                            on_click=lambda _, x=job.id, s=status: self.toggle_job(x, s),
-                                        ),
-                                        ft.IconButton(
-                                            icon=ft.icons.DELETE,
-                                            icon_color=ft.colors.RED,
-                                            tooltip="删除",
-                                            on_click=lambda _, x=job.id: self.delete_job(x),
-                                        ),
-                                    ])
-                                ),
-                            ],
-                        )
-                    )
-            self.page.update()
+                rows = []
+                row_cache = {}
+                for job in visible_jobs:
+                    signature = self._job_signature(job)
+                    cached = self._row_cache.get(job.id)
+                    if cached and cached[0] == signature:
+                        row = cached[1]
+                    else:
+                        row = self._build_job_row(job, signature)
+                    row_cache[job.id] = (signature, row)
+                    rows.append(row)
+                # 只缓存当前页的行，缓存大小不超过 PAGE_SIZE
+                self._row_cache = row_cache
+
+            rows_changed = len(rows) != len(self.tasks_data.rows) or any(
+                new is not old for new, old in zip(rows, self.tasks_data.rows)
+            )
+            if rows_changed:
+                self.tasks_data.rows = rows
+
+            page_text = f"第 {self.page_index + 1}/{page_count} 页，共 {len(jobs)} 个任务"
+            label_changed = self.page_label.value != page_text
+            self.page_label.value = page_text
+
+            dirty = [c for c, changed in ((self.tasks_data, rows_changed), (self.page_label, label_changed)) if changed]
+            if dirty:
+                self.request_update(*dirty)
         except Exception as e:
             import traceback
             print(traceback.format_exc())  # 打印详细错误信息
@@ -395,6 +440,83 @@ class TaskView(BaseView):
                 ft.SnackBar(content=ft.Text(f"刷新任务列表失败: {str(e)}"))
             )
 
+    def _job_signature(self, job):
+        """
+        计算任务行签名
+        签名相同说明行内容未变化，可以直接复用已渲染的行
+        """
+        status, color = self.get_task_status(job)
+        stats = self.scheduler.get_job_stats(job.id)
+        next_run = (
+            job.next_run_time.astimezone(self.local_tz).strftime('%Y-%m-%d %H:%M:%S')
+            if job.next_run_time else "无"
+        )
+        avg_text = f"{stats['avg_ms']:.1f}ms" if stats and stats["avg_ms"] is not None else "-"
+        runs_text = f"{stats['runs']}/{stats['failures']}" if stats else "0/0"
+        return (
+            job.id,
+            job.args[1] if job.args else "未命名",
+            str(job.trigger),
+            next_run,
+            status,
+            color,
+            avg_text,
+            runs_text,
+        )
+
+    def _get_empty_row(self):
+        """空状态行，只创建一次"""
+        if self._empty_row is None:
+            self._empty_row = ft.DataRow(
+                cells=[ft.DataCell(ft.Text("暂无任务"))]
+                + [ft.DataCell(ft.Text("")) for _ in range(len(self.tasks_data.columns) - 1)],
+            )
+        return self._empty_row
+
+    def _build_job_row(self, job, signature):
+        """根据行签名构建任务行"""
+        job_id, name, trigger, next_run, status, color, avg_text, runs_text = signature
+        return ft.DataRow(
+            cells=[
+                ft.DataCell(ft.Text(job_id)),
+                ft.DataCell(ft.Text(name)),
+                ft.DataCell(ft.Text(trigger)),
+                ft.DataCell(ft.Text(next_run)),
+                ft.DataCell(
+                    ft.Container(
+                        content=ft.Text(status, color=ft.colors.WHITE),
+                        bgcolor=color,
+                        padding=5,
+                        border_radius=5,
+                    )
+                ),
+                ft.DataCell(ft.Text(avg_text)),
+                ft.DataCell(ft.Text(runs_text)),
+                ft.DataCell(
+                    ft.Row([
+                        ft.IconButton(
+                            icon=ft.icons.EDIT,
+                            icon_color=ft.colors.BLUE,
+                            tooltip="编辑",
+                            on_click=lambda _, x=job: self.show_edit_dialog(x),
+                        ),
+                        ft.IconButton(
+                            icon=ft.icons.PAUSE if status == "运行中" else ft.icons.PLAY_ARROW,
+                            icon_color=ft.colors.BLUE,
+                            tooltip="暂停/恢复",
+                            on_click=lambda _, x=job_id, s=status: self.toggle_job(x, s),
+                        ),
+                        ft.IconButton(
+                            icon=ft.icons.DELETE,
+                            icon_color=ft.colors.RED,
+                            tooltip="删除",
+                            on_click=lambda _, x=job_id: self.delete_job(x),
+                        ),
+                    ])
+                ),
+            ],
+        )
+
     def toggle_job(self, job_id, status):
         """切换任务状态"""
         try:
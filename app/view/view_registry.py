@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.lazy_import import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class ViewPolicy:
+    """视图缓存策略"""
+    PIN = "pin"              # 常驻：构建后永不淘汰
+    LRU = "lru"              # 按最近最少使用淘汰
+    TRANSIENT = "transient"  # 离开即释放
+
+
+class ViewRegistry:
+    """
+    视图注册表
+    首次导航到视图时才构建，已构建的视图保存在有界 LRU 缓存中
+    """
+
+    def __init__(self, page, viewmodel, capacity=3):
+        """
+        :param page: Flet 页面实例
+        :param viewmodel: 传递给视图的视图模型
+        :param capacity: LRU 策略视图的最大缓存数量（常驻视图不计入）
+        """
+        self.page = page
+        self.viewmodel = viewmodel
+        self.capacity = capacity
+        self._factories = {}          # name -> (factory, policy)
+        self._views = OrderedDict()   # name -> view，按最近使用排序
+        self.build_times = {}         # name -> 最近一次构建耗时（毫秒）
+        self.build_counts = {}        # name -> 构建次数
+        self._lock = threading.RLock()  # 后台预热与导航可能并发访问
+
+    def register(self, name, factory, policy=ViewPolicy.LRU):
+        """
+        注册视图
+        :param name: 视图名称
+        :param factory: 视图工厂，签名为 factory(page, viewmodel)；
+                        也可以是 "模块:类名" 字符串，首次构建时才导入
+        :param policy: 缓存策略，见 ViewPolicy
+        """
+        self._factories[name] = (factory, policy)
+
+    def get(self, name):
+        """获取视图，未构建时立即构建"""
+        if name not in self._factories:
+            raise KeyError(f"未注册的视图: {name}")
+
+        with self._lock:
+            view = self._views.get(name)
+            if view is None:
+                view = self._build(name)
+            self._views.move_to_end(name)
+            self._enforce_capacity(keep=name)
+            return view
+
+    def prewarm(self, *names):
+        """
+        预先构建视图，不影响当前显示的视图
+        LRU 视图只在缓存未满时预热，并放在最久未使用的位置
+        """
+        for name in names:
+            with self._lock:
+                if name not in self._factories or name in self._views:
+                    continue
+                policy = self._factories[name][1]
+                if policy == ViewPolicy.TRANSIENT:
+                    continue
+                if policy == ViewPolicy.LRU:
+                    lru_count = sum(
+                        1 for built in self._views
+                        if self._factories[built][1] != ViewPolicy.PIN
+                    )
+                    if lru_count >= self.capacity:
+                        continue
+                self._build(name)
+                self._views.move_to_end(name, last=False)
+
+    def peek(self, name):
+        """获取已构建的视图，不会触发构建，也不影响 LRU 顺序"""
+        return self._views.get(name)
+
+    def is_built(self, name):
+        """视图是否已构建"""
+        return name in self._views
+
+    def owner_of(self, control):
+        """
+        控件所属的已构建视图
+        :return: 视图类名，控件不在任何视图中（或尚未加入页面）时返回 None
+        """
+        with self._lock:
+            roots = {id(view.view): view for view in self._views.values() if hasattr(view, "view")}
+        while control is not None:
+            view = roots.get(id(control))
+            if view is not None:
+                return type(view).__name__
+            control = control.parent
+        return None
+
+    def release(self, name):
+        """离开视图时调用，TRANSIENT 策略的视图会被立即释放"""
+        entry = self._factories.get(name)
+        if entry and entry[1] == ViewPolicy.TRANSIENT:
+            self.evict(name)
+
+    def evict(self, name):
+        """释放已构建的视图"""
+        with self._lock:
+            view = self._views.pop(name, None)
+        if view is None:
+            return
+        dispose = getattr(view, "dispose", None)
+        if callable(dispose):
+            try:
+                dispose()
+            except Exception as e:
+                logger.error(f"释放视图失败: {name}, 错误: {e}")
+        logger.info(f"视图已释放: {name}")
+
+    def report(self):
+        """
+        获取视图构建报告
+        :return: 每个已注册视图的策略、构建状态和构建耗时
+        """
+        return [
+            {
+                "name": name,
+                "policy": policy,
+                "built": name in self._views,
+                "build_ms": self.build_times.get(name),
+                "build_count": self.build_counts.get(name, 0),
+            }
+            for name, (_, policy) in self._factories.items()
+        ]
+
+    def _build(self, name):
+        """构建视图并记录耗时"""
+        factory, policy = self._factories[name]
+        started = time.perf_counter()
+        if isinstance(factory, str):
+            factory = import_string(factory)
+            self._factories[name] = (factory, policy)
+        view = factory(self.page, self.viewmodel)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self._views[name] = view
+        self.build_times[name] = elapsed_ms
+        self.build_counts[name] = self.build_counts.get(name, 0) + 1
+        logger.info(f"视图已构建: {name} ({elapsed_ms:.1f}ms)")
+        return view
+
+    def _enforce_capacity(self, keep):
+        """淘汰超出容量的 LRU 视图，刚刚访问的视图始终保留"""
+        lru_names = [
+            name for name in self._views
+            if self._factories[name][1] != ViewPolicy.PIN
+        ]
+        overflow = len(lru_names) - self.capacity
+        for name in lru_names:
+            if overflow <= 0:
+                break
+            if name != keep:
+                self.evict(name)
+                overflow -= 1
@@ -1,12 +1,19 @@
 import flet as ft
 from app.component.SystemSettingsDialog import SystemSettingsDialog
-from app.repository.system_config_repository import SystemConfigRepository
 from app.viewmodel.system_config_viewmodel import SystemConfigViewModel
-from app.tasks.SchedulerManager import SchedulerManager
+from app.tasks.SchedulerManager import get_scheduler_manager
+from app.config.settings_store import get_settings_store
+from app.utils.debounce import Debouncer
+from app.utils.event_bus import EventBus
+from app.utils.lazy_import import lazy_import
 from collections import defaultdict
-import json
-import os
-from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.config.settings_store import SettingsStore
+    from app.repository.system_config_repository import SystemConfigRepository
+
+apscheduler_events = lazy_import("apscheduler.events")
 
 
 class AppViewModel:
@@ -14,22 +21,31 @@ class AppViewModel:
     应用程序主视图模型
     负责管理全局状态和业务逻辑
     """
-    def __init__(self, system_config_repo: SystemConfigRepository):
-        # 初始化系统配置视图模型
-        self.system_config_viewmodel = SystemConfigViewModel(system_config_repo)
+    def __init__(self, system_config_repo: "SystemConfigRepository", settings_store: "SettingsStore" = None,
+                 async_session_factory=None, write_session_factory=None):
+        # 初始化系统配置视图模型，async_session_factory 用于异步读取配置，
+        # 异步写入在线程中通过 write_session_factory 的会话经写引擎完成
+        self.system_config_viewmodel = SystemConfigViewModel(
+            system_config_repo, async_session_factory=async_session_factory,
+            write_session_factory=write_session_factory
+        )
         
         # 全局状态
         self.current_route = "/"  # 当前路由
         self.selected_nav_index = 0  # 当前选中的导航项
         
-        # 观察者（订阅者）字典
-        self.observers = {
-            "route_changed": [],      # 路由变化
-            "nav_changed": [],        # 导航选择变化
-            "theme_changed": [],      # 主题变化
-            "settings_updated": [],   # 设置更新
-            "detail_changed": []      # 详情变化
-        }
+        # 事件总线：订阅者在页面的线程池中执行，重复的主题/设置/任务事件只保留最新一次
+        self.events = EventBus(
+            topics=[
+                "route_changed",      # 路由变化
+                "nav_changed",        # 导航选择变化
+                "theme_changed",      # 主题变化
+                "settings_updated",   # 设置更新
+                "detail_changed",     # 详情变化
+                "jobs_changed",       # 定时任务变化（已合并防抖）
+            ],
+            coalesce=["theme_changed", "settings_updated", "jobs_changed"],
+        )
 
         self.system_config_repo = system_config_repo
         self._subscribers = defaultdict(list)
@@ -39,68 +55,85 @@ class AppViewModel:
         }
 
         self.subscribers = {}
-        self.settings = self._load_settings()
-        self.scheduler = SchedulerManager()  # 添加调度器实例
-        self.scheduler.start()  # 启动调度器
-
-        # 初始化系统配置
-        self.system_config = {
-            "theme": self.get_setting("theme", "light"),
-            "language": self.get_setting("language", "zh_CN"),
-            "window_width": self.get_setting("window_width", 1200),
-            "window_height": self.get_setting("window_height", 800),
-            "opacity": self.get_setting("opacity", 1.0),
-        }
+        # 统一设置存储，与启动阶段、系统设置弹窗读写同一份数据
+        self.settings_store = settings_store or get_settings_store()
+        self.settings_store.subscribe(self._on_settings_changed)
+        self.scheduler = get_scheduler_manager()  # 共享调度器，由 start_scheduler 启动
+
+        # 调度器事件合并后再通知界面，避免每个事件都重绘
+        self._jobs_changed_debouncer = Debouncer(
+            lambda: self.notify("jobs_changed"), delay=0.3, max_wait=1.0
+        )
+        self.scheduler.subscribe(
+            self._on_scheduler_event,
+            apscheduler_events.EVENT_JOB_ADDED
+            | apscheduler_events.EVENT_JOB_REMOVED
+            | apscheduler_events.EVENT_JOB_MODIFIED
+            | apscheduler_events.EVENT_JOB_EXECUTED
+            | apscheduler_events.EVENT_JOB_ERROR
+            | apscheduler_events.EVENT_JOB_MISSED
+            | apscheduler_events.EVENT_ALL_JOBS_REMOVED,
+        )
+
+    def start_scheduler(self):
+        """启动调度器，在首帧绘制后的后台启动阶段调用"""
+        self.scheduler.start()
 
-    def _load_settings(self):
-        """加载设置"""
-        settings_file = Path("settings.json")
-        if settings_file.exists():
-            try:
-                with open(settings_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
-
-    def _save_settings(self):
-        """保存设置"""
-        try:
-            with open("settings.json", "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=4)
-        except Exception as e:
-            print(f"保存设置失败: {e}")
+    def _on_scheduler_event(self, event):
+        """调度器事件回调，运行在调度器线程中"""
+        self._jobs_changed_debouncer.trigger()
+
+    @property
+    def settings(self):
+        """当前设置的只读快照"""
+        return self.settings_store.snapshot()
+
+    @property
+    def system_config(self):
+        """系统配置，与 settings 为同一份快照"""
+        return self.settings_store.snapshot()
 
     def get_setting(self, key, default=None):
         """获取设置值"""
-        return self.settings.get(key, default)
+        return self.settings_store.get(key, default)
 
     def save_setting(self, key, value):
-        """保存设置值"""
-        self.settings[key] = value
-        self._save_settings()
-        # 如果有对应的事件，触发通知
-        if key == "theme":
-            self.notify("theme_changed", value)
-        elif key == "language":
-            self.notify("language_changed", value)
+        """保存设置值，内存立即生效，数据库写入合并后异步完成"""
+        self.settings_store.set(key, value)
+
+    def _on_settings_changed(self, changes: dict):
+        """设置存储变化回调，转换为对应的界面事件"""
+        if "theme" in changes:
+            self.notify("theme_changed", changes["theme"])
+        if "language" in changes:
+            self.notify("language_changed", changes["language"])
+        self.notify("settings_updated")
 
     # ---- 观察者模式实现 ----
+    def bind_page(self, page: ft.Page):
+        """绑定页面，此后事件在页面的线程池中分发，发布者（如调度器线程）不会等待订阅者"""
+        self.events.set_dispatcher(EventBus.page_dispatcher(page))
+        self.scheduler.set_result_dispatcher(EventBus.page_dispatcher(page))
+
     def subscribe(self, event_name: str, callback):
-        """订阅事件"""
-        if event_name in self.observers:
-            self.observers[event_name].append(callback)
+        """
+        订阅事件
+        视图的绑定方法以弱引用保存，视图被淘汰释放后自动取消订阅；
+        lambda 和普通函数仍需调用 unsubscribe
+        """
+        self.events.subscribe(event_name, callback)
 
     def unsubscribe(self, event_name: str, callback):
         """取消订阅"""
-        if event_name in self.observers:
-            self.observers[event_name].remove(callback)
+        self.events.unsubscribe(event_name, callback)
 
     def notify(self, event_name: str, *args, **kwargs):
-        """通知观察者"""
-        if event_name in self.observers:
-            for callback in self.observers[event_name]:
-                callback(*args, **kwargs)
+        """通知观察者，立即返回，观察者稍后在页面的线程池中执行"""
+        self.events.publish(event_name, *args, **kwargs)
+
+    def subscriber_report(self):
+        """各事件当前存活的订阅者，用于排查订阅泄漏"""
+        return self.events.subscriber_report()
 
     # ---- 路由管理 ----
     def navigate_to(self, route: str):
@@ -121,15 +154,21 @@ class AppViewModel:
         self.notify("nav_changed", index)
 
     # ---- 设置管理 ----
+    def flush_settings(self):
+        """立即在后台写出尚未保存的设置"""
+        self.settings_store.flush()
+
     def show_settings(self, page: ft.Page):
         """
         显示设置对话框
         :param page: 当前页面实例
         """
+        # 先写出尚未保存的设置，弹窗从数据库读取的是最新值
+        self.settings_store.flush(wait=True)
         settings_dialog = SystemSettingsDialog(
             page=page, 
             view_model=self.system_config_viewmodel,
-            on_settings_changed=lambda: self.notify("settings_updated")
+            settings_store=self.settings_store,
         )
         settings_dialog.show()
 
@@ -139,10 +178,8 @@ class AppViewModel:
         :param key: 配置键
         :param value: 新的配置值
         """
-        success = self.system_config_viewmodel.update_config(key, {"config_value": value})
-        if success:
-            self.notify("settings_updated")
-        return success
+        self.settings_store.set(key, value)
+        return True
 
     # ---- 主题管理 ----
     def toggle_theme(self):
@@ -159,8 +196,3 @@ class AppViewModel:
     def get_detail(self, field: str) -> str:
         """获取详情数据"""
         return self._detail_data.get(field, "")
-
-    def __del__(self):
-        """清理资源"""
-        if hasattr(self, 'scheduler'):
-            self.scheduler.shutdown()
@@ -1,8 +1,20 @@
+import asyncio
+
+
 class SystemConfigViewModel:
     """系统配置业务逻辑"""
 
-    def __init__(self, repository):
+    def __init__(self, repository, async_session_factory=None, write_session_factory=None):
+        """
+        :param repository: 系统配置仓储（SystemConfigRepository 实例）
+        :param async_session_factory: 返回 AsyncSession 的函数，通常为 db_manager.get_async_session，
+                                      只用于异步读取；为空时异步方法在线程中调用同步仓储
+        :param write_session_factory: 返回会话上下文管理器的函数，通常为 db_manager.get_session_context，
+                                      异步写入在线程中通过该会话写入；为空时使用同步仓储
+        """
         self.repository = repository
+        self.async_session_factory = async_session_factory
+        self.write_session_factory = write_session_factory
         self.configs = []
 
     def load_configs(self):
@@ -31,3 +43,70 @@ class SystemConfigViewModel:
     def get_config_by_key(self, config_key):
         """根据配置键获取系统配置"""
         return self.repository.get_config_by_key(config_key)
+
+    # ---- 异步版本，供 Flet 异步事件处理函数使用 ----
+    async def _call_async(self, method_name, *args):
+        """
+        调用异步仓储的同名方法
+        未配置异步会话时在线程中调用同步仓储，同样不会阻塞事件循环
+        """
+        if self.async_session_factory is None:
+            return await asyncio.to_thread(getattr(self.repository, method_name), *args)
+
+        from app.repository.async_system_config_repository import AsyncSystemConfigRepository
+
+        async with self.async_session_factory() as session:
+            repository = AsyncSystemConfigRepository(session)
+            return await getattr(repository, method_name)(*args)
+
+    async def _write_async(self, method_name, *args):
+        """
+        在线程中调用同步仓储的写入方法
+        所有写入都经过写引擎唯一的连接，与设置存储、调度器等其他写入串行执行
+        """
+        if self.write_session_factory is None:
+            return await asyncio.to_thread(getattr(self.repository, method_name), *args)
+
+        def write():
+            from app.repository.system_config_repository import SystemConfigRepository
+
+            with self.write_session_factory() as session:
+                return getattr(SystemConfigRepository(session), method_name)(*args)
+
+        return await asyncio.to_thread(write)
+
+    async def load_configs_async(self):
+        """加载所有系统配置"""
+        self.configs = await self._call_async("get_all_configs")
+        return self.configs
+
+    async def add_config_async(self, config_data):
+        """新增系统配置"""
+        new_config = await self._write_async("add_config", config_data)
+        if new_config:
+            self.configs.append(new_config)
+        return new_config
+
+    async def update_config_async(self, config_id, updates):
+        """更新系统配置"""
+        return await self._write_async("update_config", config_id, updates)
+
+    async def update_values_async(self, values: dict):
+        """
+        批量更新配置值，一个事务完成
+        :param values: 配置键 -> 新值
+        :return: 写入的配置数量，失败时返回 None
+        """
+        configs = [{"config_key": key, "config_value": value} for key, value in values.items()]
+        return await self._write_async("bulk_upsert_configs", configs, ("config_value",))
+
+    async def delete_config_async(self, config_id):
+        """删除系统配置"""
+        success = await self._write_async("delete_config", config_id)
+        if success:
+            self.configs = [cfg for cfg in self.configs if cfg["id"] != config_id]
+        return success
+
+    async def get_config_by_key_async(self, config_key):
+        """根据配置键获取系统配置"""
+        return await self._call_async("get_config_by_key", config_key)
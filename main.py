@@ -1,9 +1,13 @@
+import multiprocessing
+import time
+
+_PROCESS_STARTED = time.perf_counter()  # 进程启动时刻，用于计算首帧时间
+
 import flet as ft
 
 from app.component.ThemeManager import ThemeManager
-from app.config.database import DatabaseManager
 from app.config.global_config import GlobalConfig
-from app.repository.system_config_repository import SystemConfigRepository
+from app.utils.startup_profiler import StartupProfiler
 from app.view.app_view import AppView
 from app.viewmodel.app_viewmodel import AppViewModel
 
@@ -13,11 +17,18 @@ logger = GlobalConfig.logger  # 全局日志记录器
 def initialize_db_manager():
     """初始化数据库管理器"""
     if GlobalConfig.db_manager is None:
+        import atexit
+
+        # 延迟导入，sqlalchemy 和 dynaconf 只在后台启动阶段加载
+        from app.config.database import DatabaseManager
+
         GlobalConfig.db_manager = DatabaseManager()
+        # 退出时停止后台数据回填并释放连接；先于调度器和设置存储注册，在它们之后执行
+        atexit.register(GlobalConfig.db_manager.dispose)
         logger.info("数据库管理器已初始化。")
 
 
-def apply_global_settings(page: ft.Page, settings: dict, theme_manager: ThemeManager):
+def apply_global_settings(page: ft.Page, settings, theme_manager: ThemeManager):
     """根据全局配置应用页面设置"""
     try:
         # 设置窗口宽高
@@ -37,49 +48,146 @@ def apply_global_settings(page: ft.Page, settings: dict, theme_manager: ThemeMan
         logger.error(f"应用全局设置时出错: {e}")
 
 
-def main(page: ft.Page):
-    """Flet 应用入口"""
-    # 页面基础配置
-    page.window.center()
-    page.padding = 0  # 页面外边距
-    page.spacing = 0  # 页面控件之间的间距
+def install_update_profiler(page: ft.Page):
+    """配置 profiling.update_traffic 开启时记录页面更新流量，退出时输出报告"""
+    from app.config.config import settings
 
-    # 初始化主题管理器
-    theme_manager = ThemeManager()
+    if not settings.get("profiling.update_traffic", False):
+        return None
+    import atexit
+    from app.utils.update_profiler import UpdateProfiler
 
-    # 初始化数据库
-    initialize_db_manager()
+    profiler = UpdateProfiler(page).install()
+    if not profiler.installed:
+        return None
+    atexit.register(profiler.log_report, settings.get("profiling.update_top_n", 10))
+    return profiler
 
-    # 创建数据库会话
-    session = GlobalConfig.db_manager.get_session()
 
+def build_splash() -> ft.Control:
+    """构建启动占位界面，保证窗口外壳第一时间绘制"""
+    return ft.Container(
+        content=ft.ProgressRing(),
+        alignment=ft.alignment.center,
+        expand=True,
+    )
+
+
+def show_boot_error(page: ft.Page, error: Exception):
+    """启动失败时用错误信息替换启动占位界面"""
     try:
-        # 初始化 Repository
-        system_config_repo = SystemConfigRepository(session)
+        page.clean()
+        page.add(ft.Container(
+            content=ft.Column([
+                ft.Icon(ft.icons.ERROR_OUTLINE, size=48, color=ft.colors.RED),
+                ft.Text("应用启动失败", size=20, weight=ft.FontWeight.BOLD),
+                ft.Text(str(error), selectable=True),
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, alignment=ft.MainAxisAlignment.CENTER),
+            alignment=ft.alignment.center,
+            expand=True,
+        ))
+    except Exception as e:
+        logger.error(f"显示启动错误失败: {e}")
 
-        # 加载全局配置
-        global_settings_list = system_config_repo.get_all_configs()
-        logger.info(f"全局设置: {global_settings_list}")
 
-        # 将全局设置转换为字典
-        global_settings = {item["key"]: item["value"] for item in global_settings_list}
-        logger.info(f"转换后的全局设置: {global_settings}")
+def run_optional_phase(profiler: StartupProfiler, name: str, func):
+    """执行非关键启动阶段，失败时只记录日志，不影响后续阶段"""
+    try:
+        with profiler.phase(name):
+            func()
+    except Exception as e:
+        logger.error(f"启动阶段失败: {name}, 错误: {e}")
 
-        # 应用全局配置到页面
-        apply_global_settings(page, global_settings, theme_manager)
 
-        # 初始化 ViewModel
-        app_viewmodel = AppViewModel(system_config_repo=system_config_repo)
+def boot(page: ft.Page, theme_manager: ThemeManager, profiler: StartupProfiler):
+    """
+    后台启动流程
+    窗口外壳绘制后依次执行：数据库 -> 全局配置 -> ViewModel -> 主界面 -> 调度器 -> 托盘 -> 视图预热
+    主界面之前的阶段失败时显示错误界面；调度器、托盘和视图预热相互独立，失败时只记录日志
+    """
+    try:
+        with profiler.phase("database"):
+            initialize_db_manager()
+
+        # 创建数据库会话：写入使用写会话，加载配置使用只读会话
+        session = GlobalConfig.db_manager.get_session()
+        read_session = GlobalConfig.db_manager.get_session(read_only=True)
+
+        try:
+            with profiler.phase("load_settings"):
+                from app.config.settings_store import get_settings_store
+                from app.repository.system_config_repository import SystemConfigRepository
+
+                # 初始化 Repository
+                system_config_repo = SystemConfigRepository(session, read_session=read_session)
+
+                # 加载全局配置（类型化快照）
+                settings_store = get_settings_store()
+                global_settings = settings_store.snapshot()
+                logger.info(f"全局设置: {dict(global_settings)}")
+
+                # 应用全局配置到页面
+                apply_global_settings(page, global_settings, theme_manager)
+
+            with profiler.phase("viewmodel"):
+                # 初始化 ViewModel
+                app_viewmodel = AppViewModel(
+                    system_config_repo=system_config_repo,
+                    settings_store=settings_store,
+                    async_session_factory=GlobalConfig.db_manager.get_async_session,
+                    write_session_factory=GlobalConfig.db_manager.get_session_context,
+                )
+                app_viewmodel.bind_page(page)
+                update_profiler = install_update_profiler(page)
+
+            with profiler.phase("app_view"):
+                # 初始化 AppView
+                app_view = AppView(page=page, viewmodel=app_viewmodel)
+                if update_profiler is not None:
+                    update_profiler.view_resolver = app_view.views.owner_of
+                app_view.build()  # 构建界面
+            profiler.mark("interactive")
+
+        finally:
+            # 确保会话被正确关闭
+            session.close()
+            read_session.close()
 
-        # 初始化 AppView
-        app_view = AppView(page=page, viewmodel=app_viewmodel)
-        app_view.build()  # 构建界面
+    except Exception as e:
+        logger.error(f"应用启动失败: {e}")
+        show_boot_error(page, e)
+        profiler.log_report()
+        return
 
+    try:
+        run_optional_phase(profiler, "scheduler", app_viewmodel.start_scheduler)
+        run_optional_phase(profiler, "tray", app_view.start_tray)
+        run_optional_phase(profiler, "prewarm_views", app_view.prewarm_views)
     finally:
-        # 确保会话被正确关闭
-        session.close()
+        profiler.log_report()
+
+
+def main(page: ft.Page):
+    """Flet 应用入口"""
+    profiler = StartupProfiler(started_at=_PROCESS_STARTED)
+
+    with profiler.phase("window_shell"):
+        # 页面基础配置
+        page.window.center()
+        page.padding = 0  # 页面外边距
+        page.spacing = 0  # 页面控件之间的间距
+
+        # 初始化主题管理器
+        theme_manager = ThemeManager()
+
+        # 先绘制窗口外壳，其余工作放到后台阶段
+        page.add(build_splash())
+    profiler.mark_first_frame()
+
+    page.run_thread(boot, page, theme_manager, profiler)
 
 
 # 启动 Flet 应用
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 打包后进程池任务需要
     ft.app(target=main)
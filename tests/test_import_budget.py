@@ -0,0 +1,19 @@
+import unittest
+
+from app.utils.lazy_import import HEAVY_MODULES, check_import_budget
+
+
+class ImportBudgetTest(unittest.TestCase):
+    """main 模块的冷导入耗时和重量级依赖检查"""
+
+    def test_main_import_within_budget(self):
+        result = check_import_budget("main")
+        self.assertTrue(result["ok"], result)
+
+    def test_main_import_does_not_load_heavy_modules(self):
+        result = check_import_budget("main", heavy_modules=HEAVY_MODULES)
+        self.assertEqual(result["loaded_heavy"], [], result)
+
+
+if __name__ == "__main__":
+    unittest.main()